@@ -0,0 +1,158 @@
+"""Time and peak memory of every page computation across dataset sizes.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_pages --sizes 1e3,1e4,1e5,1e6
+    python -m benchmarks.bench_pages --sizes 1e6 --locations 51,2000
+    python -m benchmarks.bench_pages --json results.json
+    python -m benchmarks.bench_pages --baseline results.json --tolerance 1.5
+
+Each size gets a fresh synthetic dataset per ``--locations`` count; the
+default includes a high-cardinality case (2,000 locations) next to the
+51 of the synthetic default, since the bitmap index and the location series
+scale with the number of distinct locations.  ``build:*`` stages time the
+per-dataset-version structures (cube, bitmap index, tensor, gazetteer); page stages
+run with those structures already built, as they would in the app.  Time is
+the median of ``--repeat`` runs; peak memory is measured with tracemalloc in
+a separate run.  With ``--baseline`` the process exits with status 1 if any
+stage is slower than the baseline by more than ``--tolerance`` times.
+
+Sizes above ~10^7 rows need several GB of RAM.
+"""
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from dashboard import compute, synthetic
+from dashboard.bitmap import BitmapIndex
+from dashboard.cube import Cube
+from dashboard.gazetteer import Gazetteer
+from dashboard.tensor import DemographicTensor
+
+# Ignore regressions smaller than this many milliseconds (timer noise)
+NOISE_MS = 1.0
+
+# Results without a location count come from runs with the synthetic default
+DEFAULT_LOCATIONS = 51
+
+
+def default_state(dataset):
+    years = dataset.cube.values("Year")
+    pop_types = dataset.cube.values("Population Type")
+    locations = dataset.cube.values("location")
+    return {
+        "years": years,
+        "latest": [years[-1]],
+        "pop_types": pop_types,
+        "first_type": pop_types[0],
+        "filters": {"Year": years[-1], "Population Type": pop_types[0], "location": locations[:5]},
+    }
+
+
+def stages(dataset):
+    """Named zero-argument callables, one per page computation."""
+    s = default_state(dataset)
+    return {
+        "build:cube": lambda: Cube.build(dataset.frame),
+        "build:bitmap_index": lambda: BitmapIndex(dataset.frame),
+        "build:tensor": lambda: DemographicTensor(dataset.cube),
+        "build:gazetteer": lambda: Gazetteer(dataset.cube.cells["location"].cat.categories),
+        "overview:kpis": lambda: compute.overview_kpis(dataset),
+        "geographic:location_totals": lambda: compute.location_totals(dataset, s["years"], s["pop_types"]),
+        "geographic:top_locations": lambda: compute.top_locations(dataset, s["years"], s["pop_types"]),
+        "demographics:gender_totals": lambda: compute.gender_totals(dataset, s["latest"], [s["first_type"]]),
+        "demographics:age_gender_stacked": lambda: compute.age_gender_stacked(dataset, s["latest"], [s["first_type"]]),
+        "demographics:age_gender_long": lambda: compute.age_gender_long(dataset, s["years"], s["first_type"]),
+        "trends:trend_data": lambda: compute.trend_data(dataset, s["years"], s["pop_types"]),
+        "trends:yoy": lambda: compute.yoy_change(compute.trend_data(dataset, s["years"], s["pop_types"])),
+        "trends:composition": lambda: compute.composition_pct(compute.trend_data(dataset, s["years"], s["pop_types"])),
+        "trends:stats": lambda: compute.trend_stats(compute.trend_data(dataset, s["years"], s["pop_types"])),
+        "trends:peaks_valleys": lambda: compute.peaks_valleys(compute.trend_data(dataset, s["years"], s["pop_types"])),
+        "trends:rolling_mean": lambda: compute.rolling_mean(compute.trend_data(dataset, s["years"], s["pop_types"])),
+        "trends:location_series_stats": lambda: compute.series_stats(dataset, s["years"], s["pop_types"]),
+        "deep_dive:filter": lambda: len(compute.deep_dive_selection(dataset, s["filters"], ["Female Total"])),
+        "deep_dive:groups": lambda: compute.deep_dive_groups(dataset, {}, [], ["Year", "location"]),
+        "deep_dive:summary": lambda: compute.population_type_summary(dataset),
+        "deep_dive:subgroup": lambda: compute.subgroup_totals(dataset, "location", "Year"),
+    }
+
+
+def measure(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times) * 1000, peak / 2**20
+
+
+def run(sizes, repeat=5, seed=0, locations=(DEFAULT_LOCATIONS,)):
+    results = []
+    for size in sizes:
+        for n_locations in locations:
+            dataset = synthetic.dataset(size, seed=seed, n_locations=n_locations)
+            # Build shared structures up front, as a warm app process would have them
+            dataset.cube, dataset.bitmap_index, dataset.gazetteer, dataset.tensor
+            for name, func in stages(dataset).items():
+                ms, mb = measure(func, repeat)
+                results.append({"rows": size, "locations": n_locations, "stage": name,
+                                "ms": round(ms, 3), "peak_mb": round(mb, 2)})
+                print(f"{size:>11,} {n_locations:>6,} {name:<36} {ms:>10.2f} ms {mb:>9.2f} MB", flush=True)
+            del dataset
+            gc.collect()
+    return results
+
+
+def _key(result):
+    return result["rows"], result.get("locations", DEFAULT_LOCATIONS), result["stage"]
+
+
+def regressions(results, baseline, tolerance):
+    expected = {_key(r): r["ms"] for r in baseline}
+    slow = []
+    for r in results:
+        base = expected.get(_key(r))
+        if base is not None and r["ms"] > base * tolerance and r["ms"] - base > NOISE_MS:
+            slow.append((*_key(r), base, r["ms"]))
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1e3,1e4,1e5,1e6",
+                        help="comma-separated row counts, e.g. 1e3,1e5,1e8")
+    parser.add_argument("--locations", default=f"{DEFAULT_LOCATIONS},2000",
+                        help="comma-separated distinct location counts per size")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against results from a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    sizes = [int(float(size)) for size in args.sizes.split(",")]
+    locations = [int(n) for n in args.locations.split(",")]
+    results = run(sizes, repeat=args.repeat, seed=args.seed, locations=locations)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=1)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            slow = regressions(results, json.load(fh), args.tolerance)
+        for rows, n_locations, stage, base, ms in slow:
+            print(f"REGRESSION {rows:,} x {n_locations:,} locations {stage}: {base:.2f} ms -> {ms:.2f} ms")
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
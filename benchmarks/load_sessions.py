@@ -0,0 +1,318 @@
+"""Concurrent-session load test of ``app.py``.
+
+Run from the repository root::
+
+    python -m benchmarks.load_sessions --sessions 8 --iterations 3
+    python -m benchmarks.load_sessions --sizes 1e4,1e6 --processes 2 --json load.json
+    python -m benchmarks.load_sessions --baseline load.json --tolerance 1.5
+
+Each size gets a synthetic dataset written to ``.cache/loadtest/`` and
+served through ``DASHBOARD_DATA``.  ``--processes`` worker processes each
+stand in for one server process.  A worker drives ``--sessions`` / ``--processes``
+concurrent sessions headlessly with Streamlit's ``AppTest``, one thread per
+session, sharing the process's ``st.cache_resource`` caches as a real
+server's sessions do.  ``AppTest`` swaps process-global runtime state on
+every run, so a worker executes one rerun at a time; the wait counts
+towards latency, like requests queueing for a GIL-bound server process.
+Use ``--processes`` for parallelism.
+
+Every session follows a click path: it visits the five pages in a random
+order and makes one to three widget changes on each, such as the Deep Dive
+filters, chart type and group-by.  Every rerun is timed.  Paths come from
+``--seed``, so runs are repeatable and releases can be compared.
+
+Unless ``DASHBOARD_WARMUP=0``, the default views are built up front with
+``python -m dashboard.warmup``, as in a deploy step.  A worker then does
+one untimed run, so loading the dataset is reported separately as
+``cold_ms``.  The report gives reruns per second across all
+workers, and p50/p95/p99 rerun latency overall and per page.  Memory is
+each worker's resident set size after the cold run and at the end; the
+growth between the two shows leaks and unbounded caches.  With
+``--baseline`` the process exits with status 1 if p95 latency grew, or
+throughput fell, by more than ``--tolerance`` times.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app.py"
+DATA_DIR = ROOT / ".cache" / "loadtest"
+PAGES = ["Overview", "Geographic Distribution", "Demographics", "Population Type Trends", "Deep Dive Explorer"]
+TIMEOUT = 300
+
+_run_lock = threading.Lock()
+
+# Ignore p95 regressions smaller than this many milliseconds (timer noise)
+NOISE_MS = 5.0
+
+
+# ---- Click paths: each action changes one widget, or returns None if it isn't shown ---- #
+def _widget(at, kind, label):
+    return next((w for w in getattr(at, kind) if w.label == label), None)
+
+
+def _choose(at, kind, label, rng):
+    widget = _widget(at, kind, label)
+    if widget is None:
+        return None
+    return widget.set_value(rng.choice(widget.options))
+
+
+def _subset(at, label, rng):
+    widget = _widget(at, "multiselect", label)
+    if widget is None:
+        return None
+    options = widget.options
+    return widget.set_value(rng.sample(options, rng.randint(1, len(options))))
+
+
+def _toggle(at, label):
+    widget = _widget(at, "checkbox", label)
+    return None if widget is None else widget.set_value(not widget.value)
+
+
+def _next_page(at):
+    widget = next((w for w in at.number_input if w.label.startswith("Page (of")), None)
+    if widget is None or not widget.proto.has_max or widget.proto.max < 2:
+        return None
+    return widget.set_value(int(widget.value) % int(widget.proto.max) + 1)
+
+
+ACTIONS = {
+    "Overview": {
+        "toggle_full_table": lambda at, rng: _toggle(at, "Show full dataset"),
+        "next_table_page": lambda at, rng: _next_page(at),
+    },
+    "Geographic Distribution": {
+        "years": lambda at, rng: _subset(at, "Select Year(s)", rng),
+        "pop_types": lambda at, rng: _subset(at, "Select Population Type(s)", rng),
+    },
+    "Demographics": {
+        "years": lambda at, rng: _subset(at, "Select Year(s)", rng),
+        "pie_mode": lambda at, rng: _choose(at, "radio", "Choose View", rng),
+        "relation_type": lambda at, rng: _choose(at, "radio", "Select Population Type", rng),
+    },
+    "Population Type Trends": {
+        "years": lambda at, rng: _subset(at, "Select Year(s)", rng),
+        "pop_types": lambda at, rng: _subset(at, "Select Population Type(s)", rng),
+    },
+    "Deep Dive Explorer": {
+        "year": lambda at, rng: _choose(at, "selectbox", "Year", rng),
+        "gender": lambda at, rng: _choose(at, "selectbox", "Gender", rng),
+        "urban_rural": lambda at, rng: _choose(at, "selectbox", "Urban/Rural", rng),
+        "pop_type": lambda at, rng: _choose(at, "selectbox", "Population Type", rng),
+        "chart_type": lambda at, rng: _choose(at, "radio", "Choose Chart Type", rng),
+        "group_by": lambda at, rng: _choose(at, "selectbox", "Group By", rng),
+        "subgroup": lambda at, rng: _choose(at, "selectbox", "First Category", rng),
+    },
+}
+
+
+def rss_mb():
+    """Current resident set size of this process."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:  # not Linux: fall back to the peak
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def percentile(values, q):
+    from dashboard.tracing import percentile
+
+    return round(percentile(values, q), 3) if values else None
+
+
+def _timed_run(at, samples, page, action):
+    start = time.perf_counter()
+    with _run_lock:
+        at.run(timeout=TIMEOUT)
+    ms = (time.perf_counter() - start) * 1000
+    error = at.exception[0].message if at.exception else None
+    samples.append({"page": page, "action": action, "ms": ms, "error": error})
+
+
+def session(index, iterations, seed, samples, barrier):
+    """One simulated user: ``iterations`` passes over the pages, recording each rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed * 100_003 + index)
+    at = AppTest.from_file(str(APP), default_timeout=TIMEOUT)
+    barrier.wait()
+    page, name = "Overview", "open"
+    try:
+        _timed_run(at, samples, page, name)
+        for _ in range(iterations):
+            for page in rng.sample(PAGES, len(PAGES)):
+                at.button(key=page).click()
+                name = "visit"
+                _timed_run(at, samples, page, name)
+                actions = ACTIONS[page]
+                for name in rng.sample(sorted(actions), min(rng.randint(1, 3), len(actions))):
+                    if actions[name](at, rng) is not None:
+                        _timed_run(at, samples, page, name)
+    except Exception as exc:  # a broken session counts as an error, the others carry on
+        samples.append({"page": page, "action": name, "ms": None, "error": f"{type(exc).__name__}: {exc}"})
+
+
+def worker(sessions, iterations, seed):
+    """Drive ``sessions`` concurrent sessions in this process; returns raw measurements."""
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    cold = AppTest.from_file(str(APP), default_timeout=TIMEOUT).run(timeout=TIMEOUT)
+    cold_ms = (time.perf_counter() - start) * 1000
+    if cold.exception:
+        raise RuntimeError(f"app failed on first run: {cold.exception[0].message}")
+    rss_warm = rss_mb()
+
+    samples = []
+    barrier = threading.Barrier(sessions + 1)
+    threads = [
+        threading.Thread(target=session, args=(i, iterations, seed, samples, barrier), daemon=True)
+        for i in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return {
+        "cold_ms": round(cold_ms, 3),
+        "seconds": time.perf_counter() - start,
+        "rss_warm_mb": round(rss_warm, 1),
+        "rss_end_mb": round(rss_mb(), 1),
+        "samples": samples,
+    }
+
+
+def dataset_path(size, seed):
+    from dashboard import synthetic
+
+    path = DATA_DIR / f"loadtest_{size}_{seed}.csv"
+    if not path.exists():
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        synthetic.write_csv(tmp, size, seed=seed)
+        os.replace(tmp, path)
+    return path
+
+
+def summarize(size, sessions, processes, results):
+    samples = [s for r in results for s in r["samples"] if s["ms"] is not None]
+    errors = [s["error"] for r in results for s in r["samples"] if s["error"]]
+    times = [s["ms"] for s in samples]
+    seconds = max(r["seconds"] for r in results)
+    pages = {}
+    for s in samples:
+        pages.setdefault(s["page"], []).append(s["ms"])
+    return {
+        "rows": size,
+        "sessions": sessions,
+        "processes": processes,
+        "reruns": len(samples),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": round(seconds, 3),
+        "reruns_per_s": round(len(samples) / seconds, 3) if seconds else None,
+        "p50_ms": percentile(times, 50),
+        "p95_ms": percentile(times, 95),
+        "p99_ms": percentile(times, 99),
+        "pages": {page: {"p50_ms": percentile(ms, 50), "p95_ms": percentile(ms, 95)} for page, ms in pages.items()},
+        "cold_ms": [r["cold_ms"] for r in results],
+        "rss_warm_mb": [r["rss_warm_mb"] for r in results],
+        "rss_end_mb": [r["rss_end_mb"] for r in results],
+        "rss_growth_mb": [round(r["rss_end_mb"] - r["rss_warm_mb"], 1) for r in results],
+    }
+
+
+def run(sizes, sessions=8, processes=1, iterations=3, seed=0):
+    """Load-test every size with fresh worker processes; returns one summary per size."""
+    reports = []
+    for size in sizes:
+        path = dataset_path(size, seed)
+        env = {**os.environ, "DASHBOARD_DATA": str(path),
+               "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")]))}
+        if os.environ.get("DASHBOARD_WARMUP", "1") != "0":
+            # As in a deploy step: workers then seed their figure caches from disk
+            subprocess.run([sys.executable, "-m", "dashboard.warmup", "--data", str(path)],
+                           cwd=ROOT, env=env, stdout=subprocess.DEVNULL, check=True)
+        shares = [sessions // processes + (i < sessions % processes) for i in range(processes)]
+        children = [
+            subprocess.Popen([sys.executable, "-m", "benchmarks.load_sessions", "--worker",
+                              "--sessions", str(share), "--iterations", str(iterations), "--seed", str(seed * 100 + i)],
+                             cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+            for i, share in enumerate(shares) if share
+        ]
+        results = []
+        for child in children:
+            out, _ = child.communicate()
+            if child.returncode != 0:
+                raise RuntimeError(f"load worker exited with status {child.returncode}")
+            results.append(json.loads(out.strip().splitlines()[-1]))
+        report = summarize(size, sessions, len(children), results)
+        reports.append(report)
+        print(f"{size:>11,} rows {sessions:>3} sessions: {report['reruns_per_s']:>7.2f} reruns/s  "
+              f"p50 {report['p50_ms']:>8.1f}  p95 {report['p95_ms']:>8.1f}  p99 {report['p99_ms']:>8.1f} ms  "
+              f"errors {report['errors']}  RSS growth {report['rss_growth_mb']} MB", flush=True)
+    return reports
+
+
+def regressions(reports, baseline, tolerance):
+    expected = {(r["rows"], r["sessions"], r["processes"]): r for r in baseline}
+    slow = []
+    for r in reports:
+        base = expected.get((r["rows"], r["sessions"], r["processes"]))
+        if base is None:
+            continue
+        if r["p95_ms"] > base["p95_ms"] * tolerance and r["p95_ms"] - base["p95_ms"] > NOISE_MS:
+            slow.append((r["rows"], "p95_ms", base["p95_ms"], r["p95_ms"]))
+        if r["reruns_per_s"] * tolerance < base["reruns_per_s"]:
+            slow.append((r["rows"], "reruns_per_s", base["reruns_per_s"], r["reruns_per_s"]))
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1e4", help="comma-separated synthetic row counts")
+    parser.add_argument("--sessions", type=int, default=8, help="concurrent sessions in total")
+    parser.add_argument("--processes", type=int, default=1, help="server processes to spread sessions over")
+    parser.add_argument("--iterations", type=int, default=3, help="passes over the five pages per session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against results from a previous --json run")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(worker(args.sessions, args.iterations, args.seed)))
+        return 0
+
+    sizes = [int(float(size)) for size in args.sizes.split(",")]
+    reports = run(sizes, sessions=args.sessions, processes=max(args.processes, 1),
+                  iterations=args.iterations, seed=args.seed)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(reports, fh, indent=1)
+    if args.baseline:
+        with open(args.baseline) as fh:
+            slow = regressions(reports, json.load(fh), args.tolerance)
+        for rows, metric, base, value in slow:
+            print(f"REGRESSION {rows:,} {metric}: {base:.2f} -> {value:.2f}")
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
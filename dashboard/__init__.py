@@ -0,0 +1 @@
+"""Data access and computation helpers for the Sri Lanka demographics dashboard."""
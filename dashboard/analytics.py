@@ -0,0 +1,169 @@
+"""Vectorized time-series analytics over a year-by-series matrix.
+
+A :class:`SeriesMatrix` holds one column per series (a population type, or
+any combination of cube dimensions such as location x population type) and
+one row per year, with NaN where a series has no observation.  Every metric
+is computed for all series at once with NumPy reductions along the year axis,
+so thousands of series cost about as much as a handful.
+
+Metrics follow the Trends page's definitions: YoY change is measured against
+the series' previous *observed* year, and CAGR uses the first and last
+observed points over ``n - 1`` periods for ``n`` observations (0 for a single
+observation).  Rolling means average the observed values in a trailing
+window of calendar years.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _no_positions():
+    return np.zeros(0, dtype=np.intp)
+
+
+class SeriesMatrix:
+    """Values of many yearly series aligned on a common year axis."""
+
+    def __init__(self, years, series, values, cells=None):
+        self.years = pd.Index(years, name="Year")
+        self.series = series
+        self.values = values
+        self.observed = ~np.isnan(values)
+        # (year, series) positions of the rows of the long frame the matrix came from
+        self.cells = cells
+
+    @classmethod
+    def from_long(cls, frame, series, time="Year", value="Total"):
+        """Pivot a long frame with one row per (time, series) key."""
+        series = list(series)
+        keys = frame[series[0]] if len(series) == 1 else pd.MultiIndex.from_frame(frame[series])
+        series_codes, labels = pd.factorize(keys, sort=True)
+        time_codes, years = pd.factorize(frame[time], sort=True)
+        labels = pd.Index(labels, name=series[0]) if len(series) == 1 else labels
+        values = np.full((len(years), len(labels)), np.nan)
+        values[time_codes, series_codes] = frame[value].to_numpy(dtype=float)
+        return cls(years, labels, values, cells=(time_codes, series_codes))
+
+    @classmethod
+    def from_cube(cls, cube, series, filters=None, value="Total"):
+        """Series of ``value`` per year for each combination of the ``series`` dimensions."""
+        series = list(series)
+        return cls.from_long(cube.rollup(["Year"] + series, measures=(value,), filters=filters),
+                             series, value=value)
+
+    def __len__(self):
+        return len(self.series)
+
+    def frame(self, values=None):
+        """``values`` (default: the matrix) as a Year x series DataFrame."""
+        return pd.DataFrame(self.values if values is None else values, index=self.years, columns=self.series)
+
+    def at_rows(self, values):
+        """A year-by-series array read back in the row order of the source frame."""
+        return values[self.cells]
+
+    def appearance_order(self):
+        """Series positions in order of first appearance in the source frame."""
+        first = np.full(len(self.series), len(self.cells[1]))
+        np.minimum.at(first, self.cells[1], np.arange(len(self.cells[1])))
+        return np.argsort(first, kind="stable")
+
+    def series_frame(self, **columns):
+        """One row per series with its labels followed by ``columns``."""
+        result = self.series.to_frame(index=False)
+        for name, values in columns.items():
+            result[name] = values
+        return result
+
+    # ---- Per-observation metrics ---- #
+    def previous_observed(self):
+        """Value of each series at its previous observed year (NaN if none)."""
+        rows = np.arange(len(self.years))[:, None]
+        last = np.where(self.observed, rows, -1)
+        last = np.maximum.accumulate(last, axis=0)
+        # Shift down one year so each cell sees only earlier observations
+        prev = np.vstack([np.full((1, len(self.series)), -1), last[:-1]])
+        cols = np.broadcast_to(np.arange(len(self.series)), prev.shape)
+        result = self.values[np.maximum(prev, 0), cols]
+        result[prev < 0] = np.nan
+        return result
+
+    def yoy_change(self):
+        """Percent change from the previous observed year; NaN where unobserved."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            change = (self.values / self.previous_observed() - 1) * 100
+        change[~self.observed] = np.nan
+        return change
+
+    def rolling_mean(self, window=3):
+        """Mean of the observed values in the trailing ``window`` years; NaN where unobserved.
+
+        The window spans calendar years, so a gap in the year axis shortens it
+        instead of reaching further back, and early years average what they have.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1 year")
+        filled = np.where(self.observed, self.values, 0.0)
+        zero = np.zeros((1, len(self.series)))
+        sums = np.vstack([zero, np.cumsum(filled, axis=0)])
+        counts = np.vstack([zero, np.cumsum(self.observed, axis=0)])
+        years = self.years.to_numpy(dtype=np.int64)
+        # Prefix-sum positions bounding each year's window
+        start = np.searchsorted(years, years - window + 1)
+        stop = np.arange(1, len(years) + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = (sums[stop] - sums[start]) / (counts[stop] - counts[start])
+        means[~self.observed] = np.nan
+        return means
+
+    def composition(self):
+        """Share of each series in its year's total, in percent."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.values / np.nansum(self.values, axis=1, keepdims=True) * 100
+
+    # ---- Per-series metrics ---- #
+    def first_last(self):
+        """Positions of each series' first and last observed year."""
+        if not len(self):
+            return _no_positions(), _no_positions()
+        first = np.argmax(self.observed, axis=0)
+        last = len(self.years) - 1 - np.argmax(self.observed[::-1], axis=0)
+        return first, last
+
+    def extremes(self):
+        """Year positions of each series' maximum and minimum (first occurrence)."""
+        if not len(self):
+            return _no_positions(), _no_positions()
+        low_fill = np.where(self.observed, self.values, -np.inf)
+        high_fill = np.where(self.observed, self.values, np.inf)
+        return np.argmax(low_fill, axis=0), np.argmin(high_fill, axis=0)
+
+    def cagr(self):
+        """Compound annual growth rate in percent over observed points."""
+        first, last = self.first_last()
+        cols = np.arange(len(self.series))
+        start = self.values[first, cols]
+        end = self.values[last, cols]
+        periods = self.observed.sum(axis=0) - 1
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            rate = ((end / start) ** (1 / np.where(periods > 0, periods, 1)) - 1) * 100
+        return np.where(periods > 0, rate, 0.0)
+
+    def stats(self):
+        """mean, median, std (ddof=1), min and max per series, NaN-aware."""
+        if not len(self):
+            return {name: np.zeros(0) for name in ("mean", "median", "std", "min", "max")}
+        values = self.values
+        n = self.observed.sum(axis=0)
+        filled = np.where(self.observed, values, 0.0)
+        mean = filled.sum(axis=0) / n
+        squares = np.where(self.observed, (values - mean) ** 2, 0.0).sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(squares / (n - 1))
+        std[n < 2] = np.nan
+        return {
+            "mean": mean,
+            "median": np.nanmedian(values, axis=0),
+            "std": std,
+            "min": np.where(self.observed, values, np.inf).min(axis=0),
+            "max": np.where(self.observed, values, -np.inf).max(axis=0),
+        }
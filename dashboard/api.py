@@ -0,0 +1,300 @@
+"""Standalone asyncio HTTP/JSON API over the dashboard's aggregations.
+
+Run with ``python -m dashboard.api [--host HOST] [--port PORT]``.  Endpoints
+(all ``GET``, query parameters may repeat to select several values):
+
+``/health``
+    Dataset version and row count.
+``/locations?year=&pop_type=``
+    Totals per location with map coordinates (Geographic Distribution).
+``/trends?year=&pop_type=``
+    Total, YoY change per year and population type, plus summary stats.
+``/demographics?year=&pop_type=``
+    Gender totals and counts per age group and gender.
+``/deep-dive?year=&urban_rural=&pop_type=&location=&gender=&group_by=``
+    Deep Dive Explorer filters: the matching total and, with ``group_by``
+    (Year, location, Population Type, urbanRural), totals per group.
+    ``gender`` keeps records with a non-zero total for that gender.
+
+Omitted filters mean "all values".  Responses are cached in a bounded LRU
+keyed by dataset version, path and normalized query, and carry an ETag
+derived from the same key, so ``If-None-Match`` revalidation is answered
+with 304 before any aggregation runs.  Filters that match nothing give an
+empty result, not an error; unexpected failures return a generic 500.  Aggregations run in worker threads while the event loop keeps
+accepting connections; the dataset is reloaded when the source file changes.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import traceback
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from dashboard import compute, store
+from dashboard.bitmap import INDEXED_COLUMNS
+from dashboard.cache import LRUCache, normalize_state
+
+MAX_REQUEST_LINE = 8192
+MAX_HEADERS = 100
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _records(frame):
+    # NaN (e.g. the first YoY change of a series) becomes JSON null
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _years(query):
+    try:
+        return [int(year) for year in query.get("year", [])]
+    except ValueError:
+        raise BadRequest("year must be an integer")
+
+
+def _deep_dive_options(query):
+    gender = query.get("gender", [None])[-1]
+    if gender not in (None, "Male", "Female"):
+        raise BadRequest("gender must be Male or Female")
+    group_by = query.get("group_by", [])
+    unknown = [col for col in group_by if col not in INDEXED_COLUMNS]
+    if unknown:
+        raise BadRequest(f"cannot group by {unknown}; choose from {INDEXED_COLUMNS}")
+    return gender, group_by
+
+
+def validate(path, query):
+    """Raise :class:`BadRequest` for malformed parameters of ``path``."""
+    _years(query)
+    if path == "/deep-dive":
+        _deep_dive_options(query)
+
+
+def _page_filters(dataset, query):
+    """Year and population type lists, defaulting to every value."""
+    return {
+        "years": _years(query) or dataset.cube.values("Year"),
+        "pop_types": query.get("pop_type") or dataset.cube.values("Population Type"),
+    }
+
+
+# ---- Endpoint handlers: (dataset, query) -> JSON-serializable result ---- #
+def health(dataset, query):
+    return {"rows": len(dataset)}
+
+
+def locations(dataset, query):
+    filters = _page_filters(dataset, query)
+    return {"locations": _records(compute.location_totals(dataset, filters["years"], filters["pop_types"]))}
+
+
+def trends(dataset, query):
+    filters = _page_filters(dataset, query)
+    trend = compute.trend_data(dataset, filters["years"], filters["pop_types"])
+    return {
+        "series": _records(compute.yoy_change(trend)),
+        "stats": _records(compute.trend_stats(trend)),
+    }
+
+
+def demographics(dataset, query):
+    filters = _page_filters(dataset, query)
+    return {
+        "gender": _records(compute.gender_totals(dataset, filters["years"], filters["pop_types"])),
+        "age_gender": _records(compute.age_gender_stacked(dataset, filters["years"], filters["pop_types"])),
+    }
+
+
+def deep_dive(dataset, query):
+    gender, group_by = _deep_dive_options(query)
+    filters = {
+        "Year": _years(query) or None,
+        "urbanRural": query.get("urban_rural") or None,
+        "Population Type": query.get("pop_type") or None,
+        "location": query.get("location") or None,
+    }
+    nonzero = [] if gender is None else [f"{gender} Total"]
+    selection = compute.deep_dive_selection(dataset, filters, nonzero)
+    result = {"rows": len(selection), "total": int(selection.sum("Total"))}
+    if group_by:
+        result["groups"] = _records(selection.group_sum(group_by))
+    return result
+
+
+ROUTES = {
+    "/health": health,
+    "/locations": locations,
+    "/trends": trends,
+    "/demographics": demographics,
+    "/deep-dive": deep_dive,
+}
+
+
+class QueryService:
+    """Dataset holder and response cache shared by all connections."""
+
+    def __init__(self, path=store.DATA_PATH, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes)
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._dataset = None
+
+    def dataset(self):
+        """The current dataset, reloaded if the source file changed."""
+        fingerprint = store.fingerprint(self.path)
+        if fingerprint != self._fingerprint:
+            with self._lock:
+                if fingerprint != self._fingerprint:
+                    self._dataset = store.load_dataset(self.path)
+                    self._fingerprint = fingerprint
+        return self._dataset
+
+    def respond(self, path, query, if_none_match=""):
+        """``(status, etag, body)`` for a request, from the cache when possible.
+
+        The query is validated first.  The ETag depends only on the dataset
+        version, path and normalized query, so a matching ``If-None-Match``
+        is then answered with 304 before any handler runs.
+        """
+        handler = ROUTES.get(path)
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, None, _error(f"unknown endpoint {path}")
+        try:
+            validate(path, query)
+        except BadRequest as exc:
+            return HTTPStatus.BAD_REQUEST, None, _error(str(exc))
+        dataset = self.dataset()
+        key = (dataset.version, path, normalize_state(query))
+        etag = '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+        if etag in if_none_match:
+            return HTTPStatus.NOT_MODIFIED, etag, b""
+        body = self.cache.get(key)
+        if body is None:
+            try:
+                result = handler(dataset, query)
+            except BadRequest as exc:
+                return HTTPStatus.BAD_REQUEST, None, _error(str(exc))
+            result = {"version": dataset.version, **result}
+            body = json.dumps(result, default=_json_default, allow_nan=False).encode()
+            self.cache.put(key, body)
+        return HTTPStatus.OK, etag, body
+
+
+def _error(message):
+    return json.dumps({"error": message}).encode()
+
+
+class Server:
+    """Minimal HTTP/1.1 server with keep-alive, one coroutine per connection."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                await self._dispatch(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        if len(line) > MAX_REQUEST_LINE:
+            raise ConnectionError("request line too long")
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ConnectionError("malformed request line")
+        headers = {}
+        for _ in range(MAX_HEADERS):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        # Requests are GET/HEAD only; discard any body so the connection stays in sync
+        length = int(headers.get("content-length") or 0)
+        if length:
+            await reader.readexactly(length)
+        return method, target, headers
+
+    async def _dispatch(self, writer, method, target, headers, keep_alive):
+        if method not in ("GET", "HEAD"):
+            status, etag, body = HTTPStatus.METHOD_NOT_ALLOWED, None, _error("only GET and HEAD are supported")
+        else:
+            url = urlsplit(target)
+            query = parse_qs(url.query)
+            try:
+                status, etag, body = await asyncio.to_thread(
+                    self.service.respond, url.path.rstrip("/") or "/", query, headers.get("if-none-match", ""))
+            except Exception:
+                # The details go to the server's stderr, not to the client
+                traceback.print_exc()
+                status, etag, body = HTTPStatus.INTERNAL_SERVER_ERROR, None, _error("internal error")
+        head = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if etag is not None:
+            head += [f"ETag: {etag}", "Cache-Control: no-cache"]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        if method != "HEAD":
+            writer.write(body)
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8765, path=store.DATA_PATH):
+    service = QueryService(path)
+    await asyncio.to_thread(service.dataset)
+    server = await asyncio.start_server(Server(service).handle, host, port)
+    print(f"Serving dataset {service.dataset().version} on http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP/JSON API over the dashboard's aggregations")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data", default=str(store.DATA_PATH), help="source CSV (default: DASHBOARD_DATA)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.data))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
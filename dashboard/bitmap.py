@@ -0,0 +1,136 @@
+"""Bitmap index over the categorical columns used by the Deep Dive filters.
+
+Every distinct value of a low-cardinality column owns a packed row bitmap.
+Bitmaps cost ``rows / 8`` bytes per value, so columns with more than
+:data:`BITMAP_MAX_VALUES` values (locations run into the thousands) are
+answered from their integer codes instead, marking the rows whose code is
+wanted.  Categorical codes are views of the dataset's frame, so with
+:mod:`dashboard.shared` they live in the host-wide mapping rather than in
+each process.  A filter combination is answered by OR-ing bitmaps within a
+column and AND-ing across columns, which yields a :class:`Selection` of row
+positions.  Aggregations run on the selected positions directly, so no
+filtered copy of the frame is made; exports read the selected rows in chunks.
+"""
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+INDEXED_COLUMNS = ["Year", "urbanRural", "Population Type", "location"]
+NONZERO_COLUMNS = ["Female Total", "Male Total"]
+
+# Above this many distinct values a column is filtered from its codes, not bitmaps
+BITMAP_MAX_VALUES = 64
+
+
+def value_codes(values):
+    """``(codes, labels)`` for a column, with labels sorted and all present.
+
+    A categorical column whose categories all occur reuses its own codes
+    without copying them.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.array.codes
+        categories = values.cat.categories
+        if (categories.is_monotonic_increasing and (codes >= 0).all()
+                and np.bincount(codes, minlength=len(categories)).all()):
+            return codes, pd.Index(categories)
+    codes, labels = pd.factorize(values, sort=True)
+    # Smallest signed type: missing values keep code -1
+    return codes.astype(np.min_scalar_type(-len(labels) - 1)), pd.Index(labels)
+
+
+class BitmapIndex:
+    """Row codes of :data:`INDEXED_COLUMNS`, plus packed bitmaps for the low-cardinality ones."""
+
+    def __init__(self, frame, columns=INDEXED_COLUMNS, nonzero=NONZERO_COLUMNS, max_bitmaps=BITMAP_MAX_VALUES):
+        self.frame = frame
+        self.size = len(frame)
+        self.codes = {}
+        self.labels = {}
+        self.bitmaps = {}
+        for col in columns:
+            codes, labels = value_codes(frame[col])
+            self.codes[col] = codes
+            self.labels[col] = labels
+            if len(labels) <= max_bitmaps:
+                self.bitmaps[col] = self._value_bitmaps(codes, len(labels))
+        self.nonzero = {col: np.packbits(frame[col].to_numpy() > 0) for col in nonzero}
+
+    def _value_bitmaps(self, codes, n_values):
+        return [np.packbits(codes == code) for code in range(n_values)]
+
+    def _empty(self):
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def _full(self):
+        return np.packbits(np.ones(self.size, dtype=bool))
+
+    def bitmap(self, col, values):
+        """Union of the bitmaps for ``values`` in ``col``."""
+        if np.ndim(values) == 0:
+            values = [values]
+        positions = self.labels[col].get_indexer(list(values))
+        positions = positions[positions >= 0]
+        if col not in self.bitmaps:
+            # The extra last slot is never wanted, so code -1 (missing) never matches
+            wanted = np.zeros(len(self.labels[col]) + 1, dtype=bool)
+            wanted[positions] = True
+            return np.packbits(wanted[self.codes[col]])
+        bits = self._empty()
+        for i in positions:
+            bits |= self.bitmaps[col][i]
+        return bits
+
+    def select(self, filters=None, nonzero=()):
+        """Intersect the bitmaps for ``filters`` and the ``nonzero`` count columns.
+
+        ``filters`` maps an indexed column to a value or list of values; ``None``
+        means no restriction on that column.
+        """
+        bits = self._full()
+        for col, values in (filters or {}).items():
+            if values is None:
+                continue
+            bits &= self.bitmap(col, values)
+        for col in nonzero:
+            bits &= self.nonzero[col]
+        return Selection(self, bits)
+
+
+class Selection:
+    """A set of selected rows, stored as a packed bitmap."""
+
+    def __init__(self, index, bits):
+        self.index = index
+        self.bits = bits
+
+    @cached_property
+    def rows(self):
+        return np.flatnonzero(np.unpackbits(self.bits, count=self.index.size))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def sum(self, column="Total"):
+        return self.index.frame[column].to_numpy()[self.rows].sum()
+
+    def group_sum(self, by, value="Total"):
+        """Sum ``value`` per combination of the indexed ``by`` columns."""
+        by = list(dict.fromkeys(by))
+        codes = [self.index.codes[col][self.rows] for col in by]
+        shape = [len(self.index.labels[col]) for col in by]
+        flat = np.ravel_multi_index(codes, shape) if codes else np.zeros(len(self.rows), dtype=np.intp)
+        size = int(np.prod(shape))
+        weights = self.index.frame[value].to_numpy()[self.rows]
+        sums = np.bincount(flat, weights=weights, minlength=size)
+        present = np.flatnonzero(np.bincount(flat, minlength=size))
+        keys = np.unravel_index(present, shape)
+        result = {col: self.index.labels[col][key] for col, key in zip(by, keys)}
+        result[value] = sums[present].astype(np.int64)
+        return pd.DataFrame(result)
+
+    def iter_frames(self, chunk_rows):
+        """The selected rows in frame order, ``chunk_rows`` at a time."""
+        for start in range(0, len(self.rows), chunk_rows):
+            yield self.index.frame.take(self.rows[start:start + chunk_rows])
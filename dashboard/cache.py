@@ -0,0 +1,113 @@
+"""Process-wide LRU cache for serialized Plotly figures.
+
+Figures are keyed by (dataset version, builder name, normalized filter state)
+and stored as JSON, so every Streamlit session in the process can reuse a
+figure another session already built.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from dashboard import tracing
+
+
+def normalize_state(state):
+    """Turn a filter-state mapping into a hashable, order-insensitive key."""
+    def norm(value):
+        if isinstance(value, dict):
+            return tuple(sorted((k, norm(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple, set, frozenset)):
+            return tuple(sorted((norm(v) for v in value), key=repr))
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+    return norm(state)
+
+
+class LRUCache:
+    """Thread-safe LRU mapping bounded by entry count and total size in bytes."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        size = len(value)
+        with self._lock:
+            if key in self._data:
+                self._bytes -= len(self._data.pop(key))
+            self._data[key] = value
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Size and hit/miss/eviction counters since the process started."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class FigureCache(LRUCache):
+    """LRU cache of figures produced by the builders in :mod:`dashboard.figures`."""
+
+    @staticmethod
+    def key(dataset, name, state):
+        return (dataset.version, name, normalize_state(state))
+
+    def figure(self, dataset, name, **state):
+        """Return the figure built by ``figures.<name>(dataset, **state)``, cached."""
+        # Imported here so pages without charts never load plotly
+        import plotly.io as pio
+
+        from dashboard import figures
+
+        key = self.key(dataset, name, state)
+        with tracing.span(f"figure:{name}") as span:
+            payload = self.get(key)
+            span.set(cached=payload is not None)
+            if payload is None:
+                fig = getattr(figures, name)(dataset, **state)
+                payload = fig.to_json()
+                self.put(key, payload)
+            else:
+                fig = pio.from_json(payload, skip_invalid=True)
+            span.set(nbytes=len(payload))
+        return fig
@@ -0,0 +1,196 @@
+"""Headless computations behind every dashboard page.
+
+Everything here is a pure function of a :class:`~dashboard.store.Dataset`
+(or of a frame another function returned) and plain filter values, with no
+Streamlit calls, so pages, figure builders, benchmarks and other consumers
+share one implementation.
+"""
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from dashboard.analytics import SeriesMatrix
+from dashboard.store import AGE_GROUPS, FEMALE_COLS, MALE_COLS
+from dashboard.tensor import GENDERS
+from dashboard.tracing import traced
+
+
+# ---- Overview ---- #
+@traced
+def overview_kpis(dataset):
+    cube = dataset.cube
+    return {
+        "total": int(cube.total()),
+        "population_types": len(cube.values("Population Type")),
+        "female": int(cube.total(FEMALE_COLS).sum()),
+        "male": int(cube.total(MALE_COLS).sum()),
+    }
+
+
+# ---- Geographic Distribution ---- #
+@traced
+def location_totals(dataset, years, pop_types):
+    """Totals per clean location name with map coordinates."""
+    filters = {"Year": years, "Population Type": pop_types}
+    return dataset.gazetteer.totals(dataset.cube.rollup(["location"], filters=filters))
+
+
+@traced
+def top_locations(dataset, years, pop_types, n=10):
+    """Location x Population Type totals for the ``n`` largest locations."""
+    filters = {"Year": years, "Population Type": pop_types}
+    bar_data = dataset.cube.rollup(["location", "Population Type"], filters=filters)
+    top = bar_data.groupby("location", observed=True)["Total"].sum().nlargest(n).index
+    return bar_data[bar_data["location"].isin(top)]
+
+
+# ---- Demographics ---- #
+@traced
+def gender_totals(dataset, years, pop_types):
+    filters = {"Year": years, "Population Type": pop_types}
+    return pd.DataFrame({
+        "Gender": GENDERS,
+        "Count": dataset.tensor.reduce(filters, keep=("gender",)),
+    })
+
+
+@traced
+def age_distribution(dataset, years, pop_types, gender):
+    """Counts per age group for one gender."""
+    filters = {"Year": years, "Population Type": pop_types, "gender": gender}
+    counts = dataset.tensor.reduce(filters, keep=("age",))
+    return pd.DataFrame({"Age Group": AGE_GROUPS, "Count": counts})
+
+
+@traced
+def age_gender_stacked(dataset, years, pop_types):
+    """Long-format counts per age group and gender."""
+    filters = {"Year": years, "Population Type": pop_types}
+    counts = dataset.tensor.reduce(filters, keep=("gender", "age"))
+    return pd.DataFrame({
+        "Age Group": AGE_GROUPS * len(GENDERS),
+        "Gender": np.repeat(GENDERS, len(AGE_GROUPS)),
+        "Count": counts.ravel(),
+    })
+
+
+@traced
+def age_gender_long(dataset, years, pop_type):
+    """Counts per Population Type/Gender/Age Group for one population type.
+
+    Empty when nothing is counted, so the facet chart shows no bars.
+    """
+    filters = {"Year": years, "Population Type": pop_type}
+    counts = dataset.tensor.reduce(filters, keep=("gender", "age"))
+    if not counts.any():
+        return pd.DataFrame(columns=["Population Type", "Age Group", "Gender", "Count"])
+    return pd.DataFrame({
+        "Population Type": pop_type,
+        "Age Group": AGE_GROUPS * len(GENDERS),
+        "Gender": np.repeat(GENDERS, len(AGE_GROUPS)),
+        "Count": counts.ravel(),
+    })
+
+
+# ---- Population Type Trends ---- #
+@traced
+def trend_data(dataset, years, pop_types):
+    """Total per Year and Population Type."""
+    filters = {"Year": years, "Population Type": pop_types}
+    return dataset.cube.rollup(["Year", "Population Type"], filters=filters)
+
+
+# Matrices of live trend frames, so several metrics of one selection share one pivot
+_trend_matrices = {}
+
+
+def trend_matrix(trend):
+    """Year x Population Type matrix of a :func:`trend_data` frame, built once per frame."""
+    key = id(trend)
+    matrix = _trend_matrices.get(key)
+    if matrix is None:
+        matrix = _trend_matrices[key] = SeriesMatrix.from_long(trend, ["Population Type"])
+        weakref.finalize(trend, _trend_matrices.pop, key, None)
+    return matrix
+
+
+@traced
+def peaks_valleys(trend):
+    """Peak and low row of every population type's series."""
+    matrix = trend_matrix(trend)
+    peaks, lows = matrix.extremes()
+    # Types in order of appearance, each Peak followed by its Low
+    cols = matrix.appearance_order()
+    years = np.column_stack([peaks[cols], lows[cols]]).ravel()
+    series = np.repeat(cols, 2)
+    return pd.DataFrame({
+        "kind": np.tile(["Peak", "Low"], len(matrix)),
+        "Population Type": matrix.series[series],
+        "Year": matrix.years[years],
+        "Total": matrix.values[years, series],
+    })
+
+
+@traced
+def composition_pct(trend):
+    """Share of each population type per year, in percent (Year x type)."""
+    matrix = trend_matrix(trend)
+    return matrix.frame(matrix.composition())
+
+
+@traced
+def yoy_change(trend):
+    """``trend`` with a ``YoY Change`` column in percent."""
+    yoy = trend.copy()
+    matrix = trend_matrix(trend)
+    yoy["YoY Change"] = matrix.at_rows(matrix.yoy_change())
+    return yoy
+
+
+@traced
+def rolling_mean(trend, window=3):
+    """``trend`` with a ``Rolling Mean`` column over the trailing ``window`` years."""
+    rolled = trend.copy()
+    matrix = trend_matrix(trend)
+    rolled["Rolling Mean"] = matrix.at_rows(matrix.rolling_mean(window))
+    return rolled
+
+
+@traced
+def trend_stats(trend):
+    """Summary statistics and CAGR per population type."""
+    matrix = trend_matrix(trend)
+    return matrix.series_frame(**matrix.stats(), **{"CAGR (%)": matrix.cagr()})
+
+
+@traced
+def series_stats(dataset, years, pop_types, by=("location", "Population Type")):
+    """Summary statistics and CAGR for every series of the ``by`` dimensions."""
+    filters = {"Year": years, "Population Type": pop_types}
+    matrix = SeriesMatrix.from_cube(dataset.cube, by, filters=filters)
+    return matrix.series_frame(**matrix.stats(), **{"CAGR (%)": matrix.cagr()})
+
+
+# ---- Deep Dive Explorer ---- #
+@traced
+def deep_dive_selection(dataset, filters, nonzero=()):
+    """Bitmap-index selection for the Deep Dive filters."""
+    return dataset.bitmap_index.select(filters, nonzero=nonzero)
+
+
+@traced
+def deep_dive_groups(dataset, filters, nonzero, by):
+    """Filtered totals grouped by the ``by`` columns."""
+    return deep_dive_selection(dataset, filters, nonzero).group_sum(by)
+
+
+@traced
+def population_type_summary(dataset):
+    """Per-record sum/mean/max/min of Total by population type."""
+    return dataset.summary("Population Type")
+
+
+@traced
+def subgroup_totals(dataset, compare_col1, compare_col2):
+    return dataset.cube.rollup([compare_col1, compare_col2])
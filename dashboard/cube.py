@@ -0,0 +1,75 @@
+"""Pre-aggregated demographic cube.
+
+The cube sums every count column over the dimensions the dashboard filters
+and groups by.  Pages slice and roll it up instead of scanning raw rows, so
+the work per rerun depends on the number of cells touched rather than the
+number of records.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.store import COUNT_COLS, ROW_COUNT, read_categorical
+
+DIMENSIONS = ["Year", "Population Type", "location", "urbanRural", "accommodationType"]
+TEXT_DIMENSIONS = DIMENSIONS[1:]
+
+
+class Cube:
+    """Summed counts keyed by :data:`DIMENSIONS`, stored as one flat frame."""
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    @classmethod
+    def build(cls, frame):
+        measures = [col for col in COUNT_COLS if col in frame.columns]
+        grouped = frame.groupby(DIMENSIONS, observed=True, sort=True)
+        cells = grouped[measures].sum()
+        cells[ROW_COUNT] = grouped.size()
+        return cls(cells.reset_index())
+
+    @classmethod
+    def merge(cls, parts):
+        """Combine partial cubes (e.g. one per ingested chunk) into one."""
+        if not parts:
+            return cls(pd.DataFrame(columns=DIMENSIONS + COUNT_COLS + [ROW_COUNT]))
+        cells = pd.concat([part.cells for part in parts], ignore_index=True)
+        measures = [col for col in cells.columns if col not in DIMENSIONS]
+        cells = cells.groupby(DIMENSIONS, observed=True, sort=True)[measures].sum().reset_index()
+        return cls(cells.astype({dim: "category" for dim in TEXT_DIMENSIONS}))
+
+    @classmethod
+    def read(cls, path):
+        return cls(read_categorical(path, TEXT_DIMENSIONS))
+
+    def write(self, path):
+        self.cells.to_parquet(path, index=False)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def mask(self, filters=None):
+        """Boolean mask over cells; ``filters`` maps a dimension to allowed values."""
+        mask = np.ones(len(self.cells), dtype=bool)
+        for dim, values in (filters or {}).items():
+            if values is None:
+                continue
+            if np.ndim(values) == 0:
+                values = [values]
+            mask &= self.cells[dim].isin(values).to_numpy()
+        return mask
+
+    def rollup(self, by, measures=("Total",), filters=None):
+        """Sum ``measures`` grouped by the ``by`` dimensions after filtering."""
+        by = list(dict.fromkeys(by))
+        cells = self.cells[self.mask(filters)]
+        return cells.groupby(by, observed=True)[list(measures)].sum().reset_index()
+
+    def total(self, measures="Total", filters=None):
+        """Grand total of one measure (or a Series for a list of measures)."""
+        cells = self.cells[self.mask(filters)]
+        return cells[measures].sum()
+
+    def values(self, dim):
+        """Sorted distinct values present along ``dim``."""
+        return sorted(pd.unique(self.cells[dim].astype(object)))
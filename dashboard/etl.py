@@ -0,0 +1,176 @@
+"""Build the app-ready CSV from raw UNHCR demographics exports.
+
+Replaces the preprocessing notebooks with a reproducible command::
+
+    python -m dashboard.etl demographics_residing_lka.csv [more.csv ...] --out-dir .
+
+Each raw file is split into byte-range partitions at line boundaries, and
+the partitions of all files are parsed and cleaned in parallel by one process
+pool, using all cores by default.  Cleaning is
+:func:`dashboard.store.normalize`: the HXL tag row and country codes are
+dropped, and the numeric columns are coerced in one step.  Each worker also hashes its rows.  The parent then:
+
+* drops exact duplicate rows by their 64-bit row hash, keeping the first;
+* validates the schema and the totals.  Age buckets must sum to Female and
+  Male Total, and those must sum to Total unless the row has no sex
+  breakdown (both gender totals 0);
+* writes ``revised_<stem>.csv`` with the notebooks' extra columns:
+  ``Population_Type_Encoded`` in first-appearance order, and one
+  ``PopType_*`` column per type.
+
+A JSON report per file lists row counts at each step.  ``--strict`` fails
+on rows with inconsistent totals instead of reporting them.
+"""
+import argparse
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from dashboard.store import COLUMNS, FEMALE_COLS, MALE_COLS, normalize
+
+PARTITION_BYTES = 32 * 1024 * 1024
+
+
+class ValidationError(ValueError):
+    """Raised when a raw file does not match the expected schema or totals."""
+
+
+def read_header(path):
+    with open(path, "rb") as fh:
+        header = fh.readline()
+    return header, [name.strip() for name in pd.read_csv(io.BytesIO(header), nrows=0).columns]
+
+
+def partitions(path, target_bytes=PARTITION_BYTES):
+    """Byte ranges covering the data lines of ``path``, split at newlines."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as fh:
+        start = len(fh.readline())
+        ranges = []
+        while start < size:
+            fh.seek(min(start + target_bytes, size))
+            fh.readline()
+            stop = min(fh.tell(), size)
+            ranges.append((start, stop))
+            start = stop
+    return ranges
+
+
+def clean_partition(path, start, stop):
+    """Parse and normalize one byte range; returns (rows read, frame, row hashes)."""
+    header, _ = read_header(path)
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        raw = fh.read(stop - start)
+    frame = pd.read_csv(io.BytesIO(header + raw), dtype=str, keep_default_na=False, na_values=[""])
+    read = len(frame)
+    frame = normalize(frame, categorical=False)
+    hashes = pd.util.hash_pandas_object(frame, index=False).to_numpy()
+    return read, frame, hashes
+
+
+def validate_schema(columns):
+    missing = [col for col in COLUMNS if col not in columns]
+    if missing:
+        raise ValidationError(f"missing columns: {missing}")
+
+
+def invalid_totals(frame):
+    """Boolean mask of rows whose age buckets or gender totals don't add up."""
+    female = frame[FEMALE_COLS].to_numpy(dtype=np.int64).sum(axis=1)
+    male = frame[MALE_COLS].to_numpy(dtype=np.int64).sum(axis=1)
+    female_total = frame["Female Total"].to_numpy(dtype=np.int64)
+    male_total = frame["Male Total"].to_numpy(dtype=np.int64)
+    gender_total = female_total + male_total
+    no_breakdown = gender_total == 0
+    return (
+        (female != female_total)
+        | (male != male_total)
+        | (~no_breakdown & (gender_total != frame["Total"].to_numpy(dtype=np.int64)))
+    )
+
+
+def finalize(frame):
+    """Add ``Population_Type_Encoded`` and ``PopType_*`` columns as the notebooks did."""
+    frame = frame.reset_index(drop=True)
+    codes, _ = pd.factorize(frame["Population Type"])
+    frame["Population_Type_Encoded"] = codes
+    dummies = pd.get_dummies(frame["Population Type"], prefix="PopType")
+    return pd.concat([frame, dummies], axis=1)
+
+
+def submit(pool, path, partition_bytes=PARTITION_BYTES):
+    """Queue the partitions of one raw file; returns their futures in file order."""
+    _, columns = read_header(path)
+    validate_schema(columns)
+    return [pool.submit(clean_partition, path, start, stop) for start, stop in partitions(path, partition_bytes)]
+
+
+def collect(path, futures, out_dir, strict=False):
+    """Deduplicate, validate and write one file from its partition results."""
+    start = time.perf_counter()
+    results = [future.result() for future in futures]
+
+    rows_read = sum(read for read, _, _ in results)
+    frames = [frame for _, frame, _ in results]
+    frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    hashes = np.concatenate([h for _, _, h in results]) if results else np.zeros(0, dtype=np.uint64)
+    parsed = len(frame)
+
+    # Keep the first occurrence of every row hash, in file order
+    _, first = np.unique(hashes, return_index=True)
+    frame = frame.iloc[np.sort(first)]
+
+    invalid = invalid_totals(frame)
+    if strict and invalid.any():
+        raise ValidationError(f"{int(invalid.sum())} rows in {path} have inconsistent totals")
+
+    output = finalize(frame)
+    target = Path(out_dir) / f"revised_{Path(path).stem}.csv"
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    output.to_csv(tmp, index=False)
+    os.replace(tmp, target)
+    return {
+        "source": str(path),
+        "output": str(target),
+        "partitions": len(futures),
+        "rows_read": rows_read,
+        "unparseable": rows_read - parsed,
+        "duplicates": parsed - len(frame),
+        "invalid_totals": int(invalid.sum()),
+        "rows_written": len(output),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run(sources, out_dir, workers=None, strict=False, partition_bytes=PARTITION_BYTES):
+    """Process every raw file, with all files' partitions sharing one pool; yields reports."""
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(workers) as pool:
+        queued = [(source, submit(pool, source, partition_bytes)) for source in sources]
+        for source, futures in queued:
+            yield collect(source, futures, out_dir, strict=strict)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean raw UNHCR demographics exports for the dashboard")
+    parser.add_argument("sources", nargs="+", help="raw CSV exports")
+    parser.add_argument("--out-dir", default=".", help="directory for revised_<stem>.csv files")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--partition-mb", type=float, default=PARTITION_BYTES / 2**20)
+    parser.add_argument("--strict", action="store_true", help="fail on rows with inconsistent totals")
+    args = parser.parse_args(argv)
+
+    for report in run(args.sources, args.out_dir, workers=args.workers, strict=args.strict,
+                      partition_bytes=int(args.partition_mb * 2**20)):
+        print(json.dumps(report), flush=True)
+
+
+if __name__ == "__main__":
+    main()
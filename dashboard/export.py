@@ -0,0 +1,96 @@
+"""Lazily generated, disk-cached exports of selected rows.
+
+An export is written only when a download is requested, in chunks of
+:data:`CHUNK_ROWS` rows, so no full copy of the CSV text is ever held in
+memory.  Files land under ``.cache/exports/<dataset version>/`` named by a
+hash of the filter state and format, and are published atomically; a repeat
+request for the same slice reuses the file.  The directory is trimmed to
+:data:`MAX_BYTES`, oldest files first.
+"""
+import gzip
+import hashlib
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dashboard import tracing
+from dashboard.cache import normalize_state
+from dashboard.store import CACHE_DIR, SCHEMA
+
+EXPORT_DIR = CACHE_DIR / "exports"
+CHUNK_ROWS = 100_000
+MAX_BYTES = 1024 * 1024 * 1024
+
+# Label -> (file suffix, MIME type)
+FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+_lock = threading.Lock()
+
+
+def export_path(version, state, fmt):
+    """Cache location of the ``fmt`` export of the rows selected by ``state``."""
+    digest = hashlib.sha1(repr(normalize_state(state)).encode()).hexdigest()[:16]
+    return EXPORT_DIR / version / f"{digest}{FORMATS[fmt][0]}"
+
+
+def write_export(chunks, target, fmt):
+    """Write the frames in ``chunks`` to ``target`` in format ``fmt``."""
+    if fmt == "Parquet":
+        with pq.ParquetWriter(target, SCHEMA, compression="zstd") as writer:
+            for chunk in chunks:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=SCHEMA, preserve_index=False))
+        return
+    opener = gzip.open if fmt == "CSV (gzip)" else open
+    with opener(target, "wt", encoding="utf-8", newline="") as fh:
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(fh, index=False, header=header)
+            header = False
+        if header:
+            pd.DataFrame(columns=SCHEMA.names).to_csv(fh, index=False)
+
+
+def export(dataset, state, selection, fmt):
+    """Path of the ``fmt`` export of ``selection``, generating it on the first request.
+
+    ``selection`` comes from ``dataset.bitmap_index.select`` (all rows if
+    ``None``); ``state`` is the filter state that selected it and, together
+    with the dataset version, identifies the cached file.
+    """
+    path = export_path(dataset.version, state, fmt)
+    if path.exists():
+        os.utime(path)
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    if selection is None:
+        selection = dataset.bitmap_index.select()
+    with tracing.span(f"export:{fmt}", rows=len(selection)) as span:
+        try:
+            write_export(selection.iter_frames(CHUNK_ROWS), tmp, fmt)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        span.set(nbytes=path.stat().st_size)
+    prune()
+    return path
+
+
+def prune(max_bytes=MAX_BYTES):
+    """Delete least recently used exports until the directory fits ``max_bytes``."""
+    with _lock:
+        files = [p for p in EXPORT_DIR.glob("*/*") if not p.name.endswith(".tmp")]
+        stats = sorted(((p.stat(), p) for p in files), key=lambda item: item[0].st_mtime)
+        total = sum(stat.st_size for stat, _ in stats)
+        for stat, path in stats:
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
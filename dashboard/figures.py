@@ -0,0 +1,165 @@
+"""Plotly figure builders for the dashboard pages.
+
+Each builder takes the :class:`~dashboard.store.Dataset` plus plain filter
+values and returns a figure, so results can be cached by
+:class:`~dashboard.cache.FigureCache` on (dataset version, builder, filters).
+The numbers come from :mod:`dashboard.compute`; this module only draws.
+"""
+import plotly.express as px
+
+from dashboard import compute, lod
+
+GENDER_COLORS = {"Male": "#5DADE2", "Female": "#AF7AC5"}
+PIE_MODES = ["Overall Gender Distribution", "Male Age Categories", "Female Age Categories"]
+
+
+# ---- Geographic Distribution ---- #
+def geo_top_locations(dataset, years, pop_types):
+    bar_data_top = compute.top_locations(dataset, years, pop_types)
+
+    fig = px.bar(
+        bar_data_top,
+        x="Total",
+        y="location",
+        color="Population Type" if len(pop_types) > 1 else None,
+        orientation="h",
+        title="Top 10 Locations by Total Population",
+        labels={"location": "Location", "Total": "Total Population"},
+        color_discrete_sequence=px.colors.qualitative.Set2
+    )
+    fig.update_layout(height=500)
+    return fig
+
+
+# ---- Demographics ---- #
+def _pie(data, names, title):
+    fig = px.pie(data, names=names, values="Count", title=title,
+                 color_discrete_sequence=px.colors.qualitative.Bold)
+    fig.update_traces(textposition='inside', textinfo='percent+label',
+                      textfont_size=16, textfont_color='white', textfont_family='Arial')
+    return fig
+
+
+def demographics_pie(dataset, years, pop_types, mode):
+    # 1. Overall Gender Distribution
+    if mode == "Overall Gender Distribution":
+        return _pie(compute.gender_totals(dataset, years, pop_types), "Gender", "Gender Distribution")
+
+    # 2./3. Male or Female Age Categories
+    gender = "Male" if mode == "Male Age Categories" else "Female"
+    age_data = compute.age_distribution(dataset, years, pop_types, gender)
+    return _pie(age_data, "Age Group", f"{gender} Age Distribution")
+
+
+def demographics_stacked(dataset, years, pop_types):
+    fig_bar = px.bar(
+        compute.age_gender_stacked(dataset, years, pop_types),
+        x="Age Group",
+        y="Count",
+        color="Gender",
+        barmode="stack",
+        title="Stacked Age & Gender Distribution",
+        color_discrete_map=GENDER_COLORS
+    )
+    fig_bar.update_layout(xaxis_title="Age Group", yaxis_title="Population Count")
+    return fig_bar
+
+
+def demographics_relation(dataset, years, pop_type):
+    fig_combo = px.bar(
+        compute.age_gender_long(dataset, years, pop_type),
+        x='Age Group',
+        y='Count',
+        color='Gender',
+        facet_col='Population Type',
+        barmode='group',
+        category_orders={"Age Group": ["0-4", "5-11", "12-17", "18-59", "60 or more"]},
+        title="Gender and Age Distribution by Population Type",
+        color_discrete_map=GENDER_COLORS
+    )
+    fig_combo.update_layout(height=600, xaxis_title="Age Group", yaxis_title="Population Count")
+    return fig_combo
+
+
+# ---- Population Type Trends ---- #
+def trends_annotated(dataset, years, pop_types):
+    data = compute.trend_data(dataset, years, pop_types)
+    fig = px.line(data, x='Year', y='Total', color='Population Type',
+                  title="Population Trends with Peak/Valley Annotations",
+                  markers=True,
+                  template='plotly_white')
+
+    # Add peak/valley annotations
+    for point in compute.peaks_valleys(data).itertuples():
+        fig.add_annotation(x=point.Year, y=point.Total,
+                           text=f"{point.kind}: {int(point.Total):,}",
+                           showarrow=True, arrowhead=1)
+    return fig
+
+
+def trends_small_multiples(dataset, years, pop_types):
+    data = compute.rolling_mean(compute.trend_data(dataset, years, pop_types))
+    return px.line(data, x='Year', y=['Total', 'Rolling Mean'], facet_col='Population Type',
+                   facet_col_wrap=3, height=600, labels={'variable': '', 'value': 'Total'})
+
+
+def trends_area(dataset, years, pop_types):
+    data = compute.trend_data(dataset, years, pop_types)
+    return px.area(data, x='Year', y='Total', color='Population Type',
+                   title="Relative Composition of Population Types")
+
+
+def trends_heatmap(dataset, years, pop_types):
+    percent_data = compute.composition_pct(compute.trend_data(dataset, years, pop_types))
+    return px.imshow(percent_data.T,
+                     labels=dict(x="Year", y="Population Type", color="Percentage"),
+                     text_auto=".1f",
+                     aspect="auto",
+                     color_continuous_scale='Blues')
+
+
+def trends_growth(dataset, years, pop_types):
+    yoy_data = compute.yoy_change(compute.trend_data(dataset, years, pop_types))
+    fig_growth = px.bar(yoy_data, x='Year', y='YoY Change', color='Population Type',
+                        barmode='group',
+                        title="Year-over-Year Growth Rates",
+                        labels={'YoY Change': 'Percentage Change (%)'})
+    fig_growth.add_hline(y=0, line_dash="dash")
+    return fig_growth
+
+
+# ---- Deep Dive Explorer ---- #
+def deep_dive_chart(dataset, filters, nonzero, chart_type, group_by_col):
+    if chart_type == "Bar Chart":
+        bar_data = compute.deep_dive_groups(dataset, filters, nonzero, [group_by_col])
+
+        def make(n):
+            bar_df, folded = lod.fold_other(bar_data, group_by_col, n)
+            return px.bar(bar_df, x=group_by_col, y="Total",
+                          title=lod.title("Total Population by " + group_by_col, folded, n))
+        return lod.bounded(make)
+
+    if group_by_col == "Year":
+        # If grouping by Year, just group by Year alone
+        line_df = compute.deep_dive_groups(dataset, filters, nonzero, ["Year"])
+        return px.line(line_df, x="Year", y="Total", title="Population Trend Over Time")
+
+    line_data = compute.deep_dive_groups(dataset, filters, nonzero, ["Year", group_by_col])
+
+    def make(n):
+        line_df, folded = lod.fold_other(line_data, group_by_col, n)
+        return px.line(line_df, x="Year", y="Total", color=group_by_col, markers=True,
+                       render_mode=lod.render_mode(len(line_df)),
+                       title=lod.title("Population Trend by " + group_by_col, folded, n))
+    return lod.bounded(make)
+
+
+def subgroup_comparison(dataset, compare_col1, compare_col2):
+    comparison = compute.subgroup_totals(dataset, compare_col1, compare_col2)
+
+    def make(n):
+        # Fold both axes so bars and colors stay bounded for pairs like location x Year
+        folded_df, folded = lod.fold_columns(comparison, [compare_col1, compare_col2], n)
+        return px.bar(folded_df, x=compare_col1, y="Total", color=compare_col2, barmode="group",
+                      title=lod.title(f"Population by {compare_col1} and {compare_col2}", folded, n))
+    return lod.bounded(make)
@@ -0,0 +1,109 @@
+"""Location gazetteer and vectorized map layer for Geographic Distribution.
+
+Raw ``location`` labels such as ``"Colombo : District"`` are cleaned and
+resolved to coordinates once per dataset version, working on the distinct
+labels rather than on every row.  Totals for the map are folded onto the
+clean names with ``bincount`` and rendered as one GeoJSON layer, so the map
+HTML carries a single marker definition plus point data.
+"""
+import folium
+import numpy as np
+import pandas as pd
+from folium.utilities import JsCode
+
+# Admin-level suffixes such as " : District" or " : Point"
+LEVEL_SUFFIX = r'\s*:\s*\w+'
+
+DEFAULT_COORDS = (7.8731, 80.7718)
+
+# Sri Lanka coordinates mapping
+LOCATION_COORDS = {
+    "Colombo": (6.9271, 79.8612),
+    "Kandy": (7.2906, 80.6337),
+    "Galle": (6.0535, 80.2210),
+    "Jaffna": (9.6615, 80.0255),
+    "Trincomalee": (8.5925, 81.1870),
+    "Anuradhapura": (8.3114, 80.4037),
+    "Matara": (5.9483, 80.5353),
+    "Batticaloa": (7.7167, 81.7000),
+    "Ratnapura": (6.6847, 80.4036),
+    "Ampara": (7.2833, 81.6667),
+    "Badulla": (6.9895, 81.0557),
+    "Gampaha": (7.0917, 79.9997),
+    "Hambantota": (6.1236, 81.1233),
+    "Kalutara": (6.5833, 79.9594),
+    "Kegalle": (7.2533, 80.3436),
+    "Kilinochchi": (9.3833, 80.4000),
+    "Kurunegala": (7.4867, 80.3647),
+    "Mannar": (8.9667, 79.8833),
+    "Matale": (7.4717, 80.6244),
+    "Mullaitivu": (9.2667, 80.8167),
+    "Polonnaruwa": (7.9333, 81.0000),
+    "Puttalam": (8.0333, 79.8167),
+    "Vavuniya": (8.7500, 80.5000),
+    "Dispersed in the country / territory": DEFAULT_COORDS,
+    "Other": DEFAULT_COORDS,
+}
+
+MARKER_COLOR = '#3186cc'
+
+
+def clean_locations(labels):
+    """Strip admin-level suffixes from an array of location labels."""
+    return pd.Index(labels).astype(str).str.replace(LEVEL_SUFFIX, '', regex=True)
+
+
+class Gazetteer:
+    """Maps raw location labels to clean names and coordinates."""
+
+    def __init__(self, labels, coords=LOCATION_COORDS, default=DEFAULT_COORDS):
+        self.labels = pd.Index(labels)
+        codes, names = pd.factorize(clean_locations(self.labels), sort=True)
+        self.clean_codes = codes
+        self.names = pd.Index(names)
+        resolved = np.array([coords.get(name, default) for name in self.names], dtype=float).reshape(-1, 2)
+        self.lat = resolved[:, 0]
+        self.lon = resolved[:, 1]
+
+    def totals(self, location_data, value="Total"):
+        """Fold per-location totals onto clean names with their coordinates."""
+        codes = self.clean_codes[self.labels.get_indexer(location_data["location"])]
+        sums = np.bincount(codes, weights=location_data[value].to_numpy(), minlength=len(self.names))
+        present = np.flatnonzero(np.bincount(codes, minlength=len(self.names)))
+        return pd.DataFrame({
+            "clean_location": self.names[present],
+            value: sums[present].astype(np.int64),
+            "lat": self.lat[present],
+            "lon": self.lon[present],
+        })
+
+
+def marker_layer(points, value="Total", name="Population"):
+    """One GeoJSON layer of circle markers sized by ``value``."""
+    names = points["clean_location"].tolist()
+    totals = points[value].tolist()
+    radius = (3 + points[value].to_numpy() / 100000).round(2).tolist()
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"location": loc, "population": f"{total:,}", "radius": r},
+        }
+        for loc, total, r, lat, lon in zip(names, totals, radius, points["lat"].tolist(), points["lon"].tolist())
+    ]
+    return folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name=name,
+        marker=folium.CircleMarker(color=MARKER_COLOR, fill=True, fill_color=MARKER_COLOR,
+                                   fill_opacity=0.6, weight=1),
+        on_each_feature=JsCode("function(feature, layer) { layer.setRadius(feature.properties.radius); }"),
+        popup=folium.GeoJsonPopup(fields=["location", "population"], aliases=["", "Population:"]),
+    )
+
+
+def population_map(points, value="Total"):
+    m = folium.Map(location=list(DEFAULT_COORDS), zoom_start=7, tiles="CartoDB positron")
+    # folium rejects a popup over an empty FeatureCollection; filters matching nothing show a bare map
+    if len(points):
+        marker_layer(points, value=value).add_to(m)
+    return m
@@ -0,0 +1,246 @@
+"""Chunked streaming ingest of UNHCR demographic exports.
+
+The source CSV is read ``chunksize`` rows at a time.  Each chunk is
+normalized with :func:`dashboard.store.normalize` and its rows are routed to
+a :class:`PartitionWriter` per year, which appends them to a temporary Parquet
+file, folds them into a running :class:`~dashboard.cube.Cube` and adds their
+row hashes to an order-independent content hash.  Peak memory is bounded by
+the chunk size (plus the cubes, which grow with the number of distinct
+dimension combinations rather than with rows).
+
+:func:`append` handles the common case of rows appended to the end of the
+file and only parses the new bytes; :func:`rescan` parses everything but
+only replaces partitions whose content hash changed.
+"""
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dashboard.cube import Cube
+from dashboard.store import (
+    CATEGORICAL_COLS, FORMAT_VERSION, SCHEMA, dataset_version, normalize, partition_paths,
+)
+
+CHUNK_ROWS = 250_000
+
+# Re-reduce the partial cubes once they hold this many cells in total
+MERGE_CELLS = 1_000_000
+
+READ_BLOCK = 1 << 20
+HASH_MOD = 1 << 64
+
+
+def content_hash(frame):
+    """Order-independent hash of a frame's rows, as an int in [0, 2**64)."""
+    return int(pd.util.hash_pandas_object(frame, index=False).to_numpy().sum(dtype=np.uint64))
+
+
+class RunningCube:
+    """Accumulates partial cubes and periodically merges them."""
+
+    def __init__(self, parts=(), merge_cells=MERGE_CELLS):
+        self.merge_cells = merge_cells
+        self.parts = list(parts)
+        self.pending = sum(len(part) for part in self.parts)
+
+    def add(self, chunk):
+        part = Cube.build(chunk)
+        self.parts.append(part)
+        self.pending += len(part)
+        if self.pending > self.merge_cells:
+            self.parts = [Cube.merge(self.parts)]
+            self.pending = len(self.parts[0])
+
+    def result(self):
+        return Cube.merge(self.parts)
+
+
+class PartitionWriter:
+    """Collects the rows of one year into a temporary partition.
+
+    With ``base`` (the manifest entry of an existing partition) the existing
+    rows, hash and cube are carried over first, so appended rows extend it.
+    """
+
+    def __init__(self, directory, year, base=None):
+        self.year = year
+        self.data_path, self.cube_path = partition_paths(directory, year)
+        self.tmp_data = self.data_path.with_name(f"{self.data_path.name}.{os.getpid()}.tmp")
+        self.tmp_cube = self.cube_path.with_name(f"{self.cube_path.name}.{os.getpid()}.tmp")
+        self.writer = pq.ParquetWriter(self.tmp_data, SCHEMA)
+        self.rows = 0
+        self.hash = 0
+        self.cube = RunningCube()
+        if base is not None:
+            for batch in pq.ParquetFile(self.data_path).iter_batches():
+                self.writer.write_table(pa.Table.from_batches([batch]).cast(SCHEMA))
+            self.rows = base["rows"]
+            self.hash = int(base["hash"], 16)
+            self.cube = RunningCube([Cube.read(self.cube_path)])
+
+    def write(self, rows):
+        self.writer.write_table(pa.Table.from_pandas(rows, schema=SCHEMA, preserve_index=False))
+        self.rows += len(rows)
+        self.hash = (self.hash + content_hash(rows)) % HASH_MOD
+        self.cube.add(rows)
+
+    def meta(self):
+        return {"rows": self.rows, "hash": f"{self.hash:016x}"}
+
+    def commit(self):
+        self.writer.close()
+        self.cube.result().write(self.tmp_cube)
+        os.replace(self.tmp_cube, self.cube_path)
+        os.replace(self.tmp_data, self.data_path)
+
+    def discard(self):
+        self.writer.close()
+        self.tmp_data.unlink(missing_ok=True)
+
+
+class HashingReader(io.RawIOBase):
+    """Read-through wrapper that feeds every byte read into ``digest``."""
+
+    def __init__(self, raw, digest):
+        self.raw = raw
+        self.digest = digest
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self.raw.readinto(buffer)
+        self.digest.update(memoryview(buffer)[:n])
+        return n
+
+    def tell(self):
+        return self.raw.tell()
+
+
+def _route(source, writers, make_writer, progress, start, total, **read_kwargs):
+    """Parse ``source`` in chunks and hand each year's rows to its writer."""
+    read_kwargs.setdefault("dtype", {col: str for col in CATEGORICAL_COLS})
+    for chunk in pd.read_csv(source, chunksize=CHUNK_ROWS, **read_kwargs):
+        chunk = normalize(chunk, categorical=False)
+        for year, rows in chunk.groupby("Year", sort=False):
+            year = int(year)
+            if year not in writers:
+                writers[year] = make_writer(year)
+            writers[year].write(rows)
+        if progress is not None:
+            progress(min((source.tell() - start) / total, 1.0))
+    # Make sure the digest covers any bytes the parser did not need
+    while source.read(READ_BLOCK):
+        pass
+
+
+def _source_meta(path, digest, header):
+    stat = os.stat(path)
+    with open(path, "rb") as fh:
+        fh.seek(max(stat.st_size - 1, 0))
+        last = fh.read(1)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha1": digest.hexdigest(),
+        "ends_with_newline": last in (b"\n", b""),
+        "header": header,
+    }
+
+
+def _manifest(path, digest, header, partitions):
+    return {
+        "format": FORMAT_VERSION,
+        "source": _source_meta(path, digest, header),
+        "partitions": partitions,
+        "version": dataset_version(partitions),
+    }
+
+
+def rescan(path, directory, manifest=None, progress=None):
+    """Parse the whole source and replace the partitions whose content changed."""
+    previous = manifest["partitions"] if manifest else {}
+    digest = hashlib.sha1()
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    writers = {}
+    with open(path, "rb") as fh:
+        source = HashingReader(fh, digest)
+        _route(source, writers, lambda year: PartitionWriter(directory, year), progress,
+               start=0, total=os.path.getsize(path) or 1)
+
+    partitions = {}
+    changed = []
+    for year, writer in writers.items():
+        meta = writer.meta()
+        partitions[str(year)] = meta
+        if previous.get(str(year)) == meta and writer.data_path.exists() and writer.cube_path.exists():
+            writer.discard()
+        else:
+            writer.commit()
+            changed.append(year)
+    for year in set(previous) - set(partitions):
+        for target in partition_paths(directory, year):
+            target.unlink(missing_ok=True)
+        changed.append(int(year))
+
+    rows = sum(writer.rows for writer in writers.values())
+    return {
+        "mode": "rescan" if manifest else "cold",
+        "years": sorted(changed),
+        "rows": rows,
+        "manifest": _manifest(path, digest, header, partitions),
+    }
+
+
+def append(path, directory, manifest, progress=None):
+    """Ingest only rows appended since ``manifest`` was written.
+
+    Returns ``None`` when the previously ingested bytes are not an unchanged
+    prefix of the file, in which case the caller should :func:`rescan`.
+    """
+    source_meta = manifest["source"]
+    old_size = source_meta["size"]
+    size = os.path.getsize(path)
+    if size <= old_size or not source_meta.get("ends_with_newline"):
+        return None
+
+    digest = hashlib.sha1()
+    previous = manifest["partitions"]
+    writers = {}
+    with open(path, "rb") as fh:
+        remaining = old_size
+        while remaining:
+            block = fh.read(min(READ_BLOCK, remaining))
+            if not block:
+                return None
+            digest.update(block)
+            remaining -= len(block)
+        if digest.hexdigest() != source_meta["sha1"]:
+            return None
+
+        def make_writer(year):
+            return PartitionWriter(directory, year, base=previous.get(str(year)))
+
+        source = HashingReader(fh, digest)
+        _route(source, writers, make_writer, progress, start=old_size, total=size - old_size,
+               header=None, names=source_meta["header"])
+
+    partitions = dict(previous)
+    for year, writer in writers.items():
+        writer.commit()
+        partitions[str(year)] = writer.meta()
+
+    new_rows = sum(writer.rows for writer in writers.values()) - sum(
+        previous[str(year)]["rows"] for year in writers if str(year) in previous
+    )
+    return {
+        "mode": "append",
+        "years": sorted(writers),
+        "rows": new_rows,
+        "manifest": _manifest(path, digest, source_meta["header"], partitions),
+    }
@@ -0,0 +1,81 @@
+"""Level-of-detail limits for charts over high-cardinality columns.
+
+Grouped chart data keeps the top :data:`MAX_CATEGORIES` values of a column by
+total and folds the rest into one "Other (N more)" category before any trace
+is built.  Line charts with more than :data:`WEBGL_POINTS` points render as WebGL
+traces, and :func:`bounded` lowers the category limit until the figure's JSON
+fits in :data:`MAX_PAYLOAD_BYTES`.  Together these keep render time and
+transfer size bounded whichever grouping column the user picks.
+"""
+import pandas as pd
+
+MAX_CATEGORIES = 15
+MIN_CATEGORIES = 3
+WEBGL_POINTS = 1000
+MAX_PAYLOAD_BYTES = 1024 * 1024
+OTHER = "Other"
+
+# Ordered axes that are never folded
+UNFOLDED = {"Year"}
+
+
+def other_label(existing, folded):
+    """Label for ``folded`` folded values that clashes with none of ``existing``.
+
+    The data has a real "Other" location, so the bucket is named
+    ``Other (N more)``, with extra parentheses in the unlikely case that is
+    taken too.
+    """
+    label = f"{OTHER} ({folded} more)"
+    existing = set(existing)
+    while label in existing:
+        label = f"({label})"
+    return label
+
+
+def fold_other(frame, col, n=MAX_CATEGORIES, value="Total"):
+    """Fold all but the ``n`` largest values of ``col`` into one other bucket.
+
+    ``frame`` holds key columns plus ``value``; folded rows are summed per
+    remaining key.  Returns the frame and the number of folded values.
+    """
+    if col in UNFOLDED:
+        return frame, 0
+    totals = frame.groupby(col, observed=True)[value].sum()
+    if len(totals) <= n:
+        return frame, 0
+    keep = set(totals.nlargest(n).index)
+    other = other_label(totals.index, len(totals) - n)
+    order = [label for label in totals.index if label in keep] + [other]
+    labels = frame[col].astype(object).where(frame[col].isin(keep), other)
+    keys = [c for c in frame.columns if c != value]
+    folded = frame.assign(**{col: pd.Categorical(labels, categories=order)})
+    folded = folded.groupby(keys, observed=True)[value].sum().reset_index()
+    return folded, len(totals) - n
+
+
+def fold_columns(frame, cols, n=MAX_CATEGORIES, value="Total"):
+    """:func:`fold_other` applied to each distinct column of ``cols``."""
+    folded = 0
+    for col in dict.fromkeys(cols):
+        frame, count = fold_other(frame, col, n, value)
+        folded += count
+    return frame, folded
+
+
+def title(text, folded, n=MAX_CATEGORIES):
+    return f"{text} (top {n} + others)" if folded else text
+
+
+def render_mode(points):
+    """Plotly Express ``render_mode`` for a line chart of ``points`` points."""
+    return "webgl" if points > WEBGL_POINTS else "auto"
+
+
+def bounded(make, n=MAX_CATEGORIES, max_bytes=MAX_PAYLOAD_BYTES):
+    """Build ``make(n)``, halving ``n`` until the figure JSON fits ``max_bytes``."""
+    while True:
+        fig = make(n)
+        if n <= MIN_CATEGORIES or len(fig.to_json()) <= max_bytes:
+            return fig
+        n = max(n // 2, MIN_CATEGORIES)
@@ -0,0 +1,101 @@
+"""Host-wide, memory-mapped copy of the dataset for multiple server processes.
+
+The first process to load a dataset version writes the row-level frame and
+the cube as uncompressed Arrow IPC files under
+``.cache/<source stem>/shared/<version>/``.  Publishing happens under an
+exclusive file lock into a temporary directory that is renamed into place,
+so readers only ever see complete files.  Every process then memory-maps the
+files and converts them to pandas without copying: numeric columns and
+category codes are read-only views of the page cache, which the kernel shares
+between processes.  Memory per host stays flat as workers are added, and a
+new worker attaches in milliseconds instead of re-reading the partitions.
+
+Set ``DASHBOARD_SHARED=0`` to give every process its own private copy.
+"""
+import contextlib
+import os
+import shutil
+
+import pyarrow as pa
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on the atomic rename alone
+    fcntl = None
+
+ENABLED = os.environ.get("DASHBOARD_SHARED", "1") != "0"
+SHARED_DIR = "shared"
+LOCK_FILE = "shared.lock"
+FRAME_FILE = "frame.arrow"
+CUBE_FILE = "cube.arrow"
+
+
+def shared_dir(directory, version):
+    return directory / SHARED_DIR / version
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Exclusive advisory lock on ``path``, held across processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def write_ipc(frame, path):
+    """Write ``frame`` as a single-batch Arrow IPC file so it maps back without copies."""
+    table = pa.Table.from_pandas(frame, preserve_index=False).combine_chunks()
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(len(table), 1))
+
+
+def read_ipc(path):
+    """Memory-map an Arrow IPC file as a DataFrame backed by the mapping."""
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return table.to_pandas(split_blocks=True, self_destruct=False)
+
+
+def publish(directory, version, frame, cube):
+    """Publish ``frame`` and ``cube`` for ``version`` unless another process already has.
+
+    ``frame`` may be a zero-argument callable so the row-level data is only
+    read by the process that actually publishes.  Older versions are removed.
+    """
+    target = shared_dir(directory, version)
+    if target.exists():
+        return target
+    with file_lock(directory / LOCK_FILE):
+        if target.exists():
+            return target
+        tmp = target.with_name(f"{version}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        try:
+            write_ipc(frame() if callable(frame) else frame, tmp / FRAME_FILE)
+            write_ipc(cube.cells, tmp / CUBE_FILE)
+            os.replace(tmp, target)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        # Processes still mapping an old version keep their pages until they unmap
+        for old in target.parent.iterdir():
+            if old != target:
+                shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+def attach(directory, version):
+    """``(frame, cube)`` mapped from the published ``version``, or ``None``."""
+    from dashboard.cube import Cube
+
+    target = shared_dir(directory, version)
+    try:
+        return read_ipc(target / FRAME_FILE), Cube(read_ipc(target / CUBE_FILE))
+    except (OSError, pa.ArrowInvalid):
+        return None
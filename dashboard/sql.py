@@ -0,0 +1,285 @@
+"""Optional SQLite backend for datasets larger than memory.
+
+With ``DASHBOARD_BACKEND=sqlite`` the row-level data lives in an indexed
+SQLite file next to the partitions (``.cache/<source stem>/demographics.sqlite``)
+instead of a DataFrame.  The file is built once per dataset version from the
+year partitions, batch by batch, with an index on each of
+:data:`~dashboard.bitmap.INDEXED_COLUMNS`; rowids follow the in-memory frame
+order.
+
+:class:`SqlDataset` keeps the cube, tensor and gazetteer of an in-memory
+dataset; they grow with the number of dimension combinations, not with rows.
+Everything that needs rows is pushed down as a query, so only aggregates or
+one page of rows reach Python:
+
+* Deep Dive filters and group-bys (:class:`SqlIndex`, :class:`SqlSelection`,
+  the stand-ins for the bitmap index and its selections);
+* per-record summaries;
+* sorting, filtering and paging of the data tables (:class:`SqlTableView`);
+* exports, streamed from a cursor.
+"""
+import contextlib
+import os
+import sqlite3
+import threading
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from dashboard.bitmap import INDEXED_COLUMNS
+from dashboard.store import CATEGORICAL_COLS, COLUMNS, COUNT_COLS, COUNT_DTYPE, YEAR_DTYPE, Dataset
+
+ENABLED = os.environ.get("DASHBOARD_BACKEND", "memory") == "sqlite"
+DB_FILE = "demographics.sqlite"
+LOCK_FILE = "sqlite.lock"
+TABLE = "demographics"
+BATCH_ROWS = 100_000
+MMAP_BYTES = 256 * 1024 * 1024
+
+SUMMARY = {"sum": "SUM", "mean": "AVG", "max": "MAX", "min": "MIN"}
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _values(values):
+    if np.ndim(values) == 0:
+        values = [values]
+    return [value.item() if isinstance(value, np.generic) else value for value in values]
+
+
+def where(filters=None, nonzero=(), ranges=None):
+    """``(clause, params)`` for value filters, non-zero count columns and inclusive ranges.
+
+    ``filters`` maps a column to a value or list of values (``None`` means no
+    restriction), like :meth:`dashboard.bitmap.BitmapIndex.select`.
+    """
+    terms, params = [], []
+    for col, values in (filters or {}).items():
+        if values is None:
+            continue
+        values = _values(values)
+        if not values:
+            return "0", []
+        terms.append(f"{quote(col)} IN ({', '.join('?' * len(values))})")
+        params += values
+    for col in nonzero:
+        terms.append(f"{quote(col)} > 0")
+    for col, (low, high) in (ranges or {}).items():
+        terms.append(f"{quote(col)} BETWEEN ? AND ?")
+        params += [int(low), int(high)]
+    return " AND ".join(terms) or "1", params
+
+
+def db_path(directory):
+    return directory / DB_FILE
+
+
+def stored_version(path):
+    try:
+        with contextlib.closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as connection:
+            return connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+    except (sqlite3.Error, TypeError):
+        return None
+
+
+def build(directory, version, partitions):
+    """Write the database for ``version`` from the year ``partitions`` unless it is current."""
+    from dashboard.shared import file_lock
+
+    target = db_path(directory)
+    if stored_version(target) == version:
+        return target
+    with file_lock(directory / LOCK_FILE):
+        if stored_version(target) == version:
+            return target
+        tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        tmp.unlink(missing_ok=True)
+        try:
+            connection = sqlite3.connect(tmp)
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            types = {"Year": "INTEGER", **{col: "TEXT" for col in CATEGORICAL_COLS},
+                     **{col: "INTEGER" for col in COUNT_COLS}}
+            connection.execute(f"CREATE TABLE {TABLE} ({', '.join(f'{quote(col)} {types[col]}' for col in COLUMNS)})")
+            insert = f"INSERT INTO {TABLE} VALUES ({', '.join('?' * len(COLUMNS))})"
+            # Partitions are in year order, so rowids match the in-memory frame's positions
+            for path in partitions:
+                for batch in pq.ParquetFile(path).iter_batches(batch_size=BATCH_ROWS, columns=COLUMNS):
+                    connection.executemany(insert, zip(*(batch.column(col).to_pylist() for col in COLUMNS)))
+            for col in INDEXED_COLUMNS:
+                connection.execute(f"CREATE INDEX {quote('idx_' + col)} ON {TABLE} ({quote(col)})")
+            connection.execute("ANALYZE")
+            connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            connection.execute("INSERT INTO meta VALUES ('version', ?)", (version,))
+            connection.commit()
+            connection.close()
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+    return target
+
+
+def typed(frame):
+    """Give a query result the store's compact dtypes (text stays ``object``)."""
+    dtypes = {"Year": YEAR_DTYPE, **{col: COUNT_DTYPE for col in COUNT_COLS}}
+    return frame.astype({col: dtype for col, dtype in dtypes.items() if col in frame.columns})
+
+
+class SqlIndex:
+    """Read-only access to the database, with one connection per thread."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            connection.execute(f"PRAGMA mmap_size = {MMAP_BYTES}")
+            self._local.connection = connection
+        return connection
+
+    def execute(self, sql, params=()):
+        return self.connection().execute(sql, params)
+
+    def query(self, sql, params=(), columns=None):
+        cursor = self.execute(sql, params)
+        columns = columns or [d[0] for d in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columns)
+
+    @cached_property
+    def labels(self):
+        """Sorted distinct values of each indexed column, read from its index."""
+        return {
+            col: pd.Index([row[0] for row in self.execute(
+                f"SELECT DISTINCT {quote(col)} FROM {TABLE} ORDER BY {quote(col)}")])
+            for col in INDEXED_COLUMNS
+        }
+
+    def select(self, filters=None, nonzero=()):
+        """:class:`SqlSelection` of the rows matching ``filters`` and ``nonzero``."""
+        clause, params = where(filters, nonzero)
+        return SqlSelection(self, clause, params)
+
+
+class SqlSelection:
+    """Rows matching a ``WHERE`` clause; aggregates run in the database."""
+
+    def __init__(self, index, clause, params):
+        self.index = index
+        self.clause = clause
+        self.params = params
+
+    @cached_property
+    def _count(self):
+        return self.index.execute(f"SELECT COUNT(*) FROM {TABLE} WHERE {self.clause}", self.params).fetchone()[0]
+
+    def __len__(self):
+        return self._count
+
+    def sum(self, column="Total"):
+        sql = f"SELECT COALESCE(SUM({quote(column)}), 0) FROM {TABLE} WHERE {self.clause}"
+        return self.index.execute(sql, self.params).fetchone()[0]
+
+    def group_sum(self, by, value="Total"):
+        """Sum ``value`` per combination of the ``by`` columns, ordered by them."""
+        by = list(dict.fromkeys(by))
+        keys = ", ".join(quote(col) for col in by)
+        sql = (f"SELECT {keys}, SUM({quote(value)}) FROM {TABLE} WHERE {self.clause} "
+               f"GROUP BY {keys} ORDER BY {keys}")
+        frame = self.index.query(sql, self.params, columns=by + [value])
+        return frame.astype({value: np.int64})
+
+    def iter_frames(self, chunk_rows):
+        """The selected rows in frame order, ``chunk_rows`` at a time."""
+        columns = ", ".join(quote(col) for col in COLUMNS)
+        cursor = self.index.execute(f"SELECT {columns} FROM {TABLE} WHERE {self.clause} ORDER BY rowid",
+                                    self.params)
+        while rows := cursor.fetchmany(chunk_rows):
+            yield typed(pd.DataFrame.from_records(rows, columns=COLUMNS))
+
+
+class SqlTableView:
+    """Sorted, filtered rows of the data table, fetched one page at a time."""
+
+    def __init__(self, index, clause, params, order):
+        self.index = index
+        self.clause = clause
+        self.params = params
+        self.order = order
+
+    @cached_property
+    def _count(self):
+        return self.index.execute(f"SELECT COUNT(*) FROM {TABLE} WHERE {self.clause}", self.params).fetchone()[0]
+
+    def __len__(self):
+        return self._count
+
+    def page(self, number, size):
+        """Rows of 1-based page ``number``."""
+        columns = ", ".join(quote(col) for col in COLUMNS)
+        sql = (f"SELECT {columns} FROM {TABLE} WHERE {self.clause} ORDER BY {self.order} "
+               f"LIMIT ? OFFSET ?")
+        frame = self.index.query(sql, [*self.params, size, (number - 1) * size], columns=COLUMNS)
+        return typed(frame)
+
+
+class SqlDataset(Dataset):
+    """A :class:`~dashboard.store.Dataset` whose rows stay in a SQLite file."""
+
+    def __init__(self, version, path, partitions=(), cube=None):
+        super().__init__(version, partitions=partitions, cube=cube)
+        self.path = path
+
+    @property
+    def columns(self):
+        return list(COLUMNS)
+
+    def head(self, n=20):
+        columns = ", ".join(quote(col) for col in COLUMNS)
+        sql = f"SELECT {columns} FROM {TABLE} ORDER BY rowid LIMIT ?"
+        return typed(self.bitmap_index.query(sql, (n,), columns=COLUMNS))
+
+    @cached_property
+    def bitmap_index(self):
+        """:class:`SqlIndex`, answering the Deep Dive filters in the database."""
+        return SqlIndex(self.path)
+
+    def categories(self, column):
+        if column not in CATEGORICAL_COLS:
+            return None
+        if column in INDEXED_COLUMNS:
+            return list(self.bitmap_index.labels[column])
+        sql = f"SELECT DISTINCT {quote(column)} FROM {TABLE} ORDER BY {quote(column)}"
+        return [row[0] for row in self.bitmap_index.execute(sql)]
+
+    def value_range(self, column):
+        sql = f"SELECT MIN({quote(column)}), MAX({quote(column)}) FROM {TABLE}"
+        low, high = self.bitmap_index.execute(sql).fetchone()
+        return int(low or 0), int(high or 0)
+
+    def summary(self, by, value="Total"):
+        aggregates = ", ".join(f"{func}({quote(value)})" for func in SUMMARY.values())
+        sql = f"SELECT {quote(by)}, {aggregates} FROM {TABLE} GROUP BY {quote(by)} ORDER BY {quote(by)}"
+        return self.bitmap_index.query(sql, columns=[by, *SUMMARY])
+
+    def table_view(self, selection=None, filters=None, column=None, ascending=True):
+        values = {col: spec for col, spec in (filters or {}).items() if col in CATEGORICAL_COLS}
+        ranges = {col: spec for col, spec in (filters or {}).items() if col not in CATEGORICAL_COLS}
+        clause, params = where(values, ranges=ranges)
+        if selection is not None:
+            clause, params = f"({selection.clause}) AND ({clause})", [*selection.params, *params]
+        direction = "ASC" if ascending else "DESC"
+        # Ties keep frame order, as the in-memory stable sort does
+        order = f"rowid {direction}" if column is None else f"{quote(column)} {direction}, rowid"
+        return SqlTableView(self.bitmap_index, clause, params, order)
+
+
+def load(directory, version, partitions, cube):
+    """:class:`SqlDataset` for ``version``, building its database first if needed."""
+    return SqlDataset(version, build(directory, version, partitions), partitions=partitions, cube=cube)
@@ -0,0 +1,107 @@
+"""Cold-start measurements: page import times and first paint per process.
+
+``app.py`` imports page modules through :func:`import_view` and calls
+:func:`record_paint` at the end of each run.  The first run of every page in
+a server process appends one JSON line to ``.cache/startup.jsonl`` with the
+process uptime, the time spent importing that page's modules and the
+script's wall time, which is the closest server-side proxy for first paint.
+
+Summarize the log with ``python -m dashboard.startup``.
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+from dashboard.store import CACHE_DIR
+
+LOG_PATH = CACHE_DIR / "startup.jsonl"
+
+
+def process_start():
+    """Wall-clock time the process started, from ``/proc``.
+
+    Falls back to the current time (i.e. this module's import) where
+    ``/proc`` is not available.
+    """
+    try:
+        with open("/proc/self/stat") as fh:
+            # Fields after the parenthesized command name; starttime is field 22 of the full line
+            starttime = int(fh.read().rpartition(")")[2].split()[19])
+        with open("/proc/stat") as fh:
+            boot = next(int(line.split()[1]) for line in fh if line.startswith("btime "))
+        return boot + starttime / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return time.time()
+
+
+# Wall-clock start of this server process, not of its first script run
+PROCESS_START = process_start()
+
+_import_times = {}
+_painted = set()
+_lock = threading.Lock()
+
+
+def import_view(name):
+    """Import ``dashboard.views.<name>``, timing the first (cold) import."""
+    module_name = f"dashboard.views.{name}"
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_times[name] = time.perf_counter() - start
+    return module
+
+
+def record_paint(page, script_start, log_path=LOG_PATH):
+    """Log the first completed run of ``page`` in this process."""
+    now = time.perf_counter()
+    wall = time.time()
+    with _lock:
+        if page in _painted:
+            return None
+        _painted.add(page)
+        first = len(_painted) == 1
+    entry = {
+        "ts": wall,
+        "pid": os.getpid(),
+        "page": page,
+        "process_first": first,
+        "uptime_s": round(wall - PROCESS_START, 4),
+        "import_s": round(_import_times.get(page, 0.0), 4),
+        "script_s": round(now - script_start, 4),
+    }
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "a") as fh:
+        fh.write(json.dumps(entry) + "\n")
+    return entry
+
+
+def summarize(log_path=LOG_PATH):
+    """Median and worst import and paint times per page."""
+    by_page = {}
+    with open(log_path) as fh:
+        for line in fh:
+            entry = json.loads(line)
+            by_page.setdefault(entry["page"], []).append(entry)
+    summary = {}
+    for page, entries in sorted(by_page.items()):
+        imports = sorted(e["import_s"] for e in entries)
+        scripts = sorted(e["script_s"] for e in entries)
+        summary[page] = {
+            "runs": len(entries),
+            "import_p50_s": imports[len(imports) // 2],
+            "import_max_s": imports[-1],
+            "paint_p50_s": scripts[len(scripts) // 2],
+            "paint_max_s": scripts[-1],
+        }
+    return summary
+
+
+if __name__ == "__main__":
+    for page, stats in summarize().items():
+        print(page, json.dumps(stats))
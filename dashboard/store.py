@@ -0,0 +1,330 @@
+"""Typed columnar store for the demographics dataset.
+
+The CSV is parsed once, normalized into compact dtypes (categorical text
+columns, downcast integer counts) and persisted under ``.cache/<source stem>/``
+as one Parquet partition per year, each next to its pre-aggregated cube
+partition.  ``manifest.json`` records the source file's size, mtime and SHA-1
+plus a content hash per year.  Later loads read the partitions directly; when
+the source changes, :func:`refresh` re-ingests only the affected years via
+:mod:`dashboard.ingest`, which streams the CSV in chunks so large exports
+never have to fit in memory as text.
+
+Loaded datasets are shared between server processes on a host through
+memory-mapped Arrow files (:mod:`dashboard.shared`).  With
+``DASHBOARD_BACKEND=sqlite`` the rows are served from an indexed SQLite file
+instead (:mod:`dashboard.sql`).
+
+Set ``DASHBOARD_DATA`` to point the dashboard at another export.
+"""
+import hashlib
+import json
+import os
+import threading
+from functools import cached_property
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_PATH = Path(os.environ.get("DASHBOARD_DATA", ROOT / "revised_demographics_residing_lka.csv"))
+CACHE_DIR = ROOT / ".cache"
+
+# Bump when the normalization below changes so old artifacts are rebuilt
+FORMAT_VERSION = 3
+
+AGE_GROUPS = ["0-4", "5-11", "12-17", "18-59", "60 or more", "Unknown"]
+FEMALE_COLS = [f"Female {age}" for age in AGE_GROUPS]
+MALE_COLS = [f"Male {age}" for age in AGE_GROUPS]
+COUNT_COLS = FEMALE_COLS + ["Female Total"] + MALE_COLS + ["Male Total", "Total"]
+CATEGORICAL_COLS = [
+    "Country of Origin Name",
+    "Country of Asylum Name",
+    "Population Type",
+    "location",
+    "urbanRural",
+    "accommodationType",
+]
+COLUMNS = ["Year"] + CATEGORICAL_COLS + COUNT_COLS
+
+# Fixed integer widths so chunks ingested separately share one schema
+YEAR_DTYPE = "int16"
+COUNT_DTYPE = "int32"
+SCHEMA = pa.schema(
+    [("Year", pa.from_numpy_dtype(YEAR_DTYPE))]
+    + [(col, pa.string()) for col in CATEGORICAL_COLS]
+    + [(col, pa.from_numpy_dtype(COUNT_DTYPE)) for col in COUNT_COLS]
+)
+
+MANIFEST = "manifest.json"
+REFRESH_LOCK = "refresh.lock"
+ROW_COUNT = "rows"
+
+
+def fingerprint(path=DATA_PATH):
+    """Return a short version string for the source file (size + mtime)."""
+    stat = os.stat(path)
+    raw = f"{FORMAT_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def normalize(df, categorical=True):
+    """Apply the notebooks' cleaning and compact dtypes to a raw frame or chunk.
+
+    Column names are stripped and the frame is restricted to :data:`COLUMNS`,
+    which drops the country codes of raw exports and the notebooks'
+    ``Population_Type_Encoded``/``PopType_*`` columns (see
+    :meth:`Dataset.population_type_encoded`).  Numbers are coerced and rows
+    that fail, such as the HXL tag row of raw exports, are dropped.  With
+    ``categorical=False`` text columns stay as strings, which is what the
+    chunked ingest writes.
+    """
+    df.columns = df.columns.str.strip()
+    df = df[COLUMNS]
+    numeric = ["Year"] + COUNT_COLS
+    df = df.assign(**{col: pd.to_numeric(df[col], errors="coerce") for col in numeric})
+    df = df.dropna()
+    df = df.astype({"Year": YEAR_DTYPE, **{col: COUNT_DTYPE for col in COUNT_COLS}})
+    if not categorical:
+        return df.astype({col: str for col in CATEGORICAL_COLS})
+    return sort_categories(df.astype({col: "category" for col in CATEGORICAL_COLS}), CATEGORICAL_COLS)
+
+
+class Dataset:
+    """The normalized demographics data together with its version string.
+
+    The row-level frame is read from its ``partitions`` only when a page first
+    needs rows; pages served from the cube never load it.
+    """
+
+    def __init__(self, version, partitions=(), frame=None, cube=None):
+        self.version = version
+        self.partitions = list(partitions)
+        self._frame_lock = threading.Lock()
+        if frame is not None:
+            self.frame = frame
+        if cube is not None:
+            self.cube = cube
+
+    def __len__(self):
+        return int(self.cube.total(ROW_COUNT))
+
+    @cached_property
+    def frame(self):
+        """Row-level frame, loaded once on first access."""
+        with self._frame_lock:
+            if "frame" not in self.__dict__:
+                self.__dict__["frame"] = read_frame(self.partitions)
+            return self.__dict__["frame"]
+
+    def head(self, n=20):
+        """First ``n`` rows, read from the first partitions if the frame isn't loaded."""
+        if "frame" in self.__dict__ or not self.partitions:
+            return self.frame.head(n)
+        batches = []
+        for path in self.partitions:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=n):
+                batches.append(batch)
+                n -= batch.num_rows
+                if n <= 0:
+                    break
+            if n <= 0:
+                break
+        return pa.Table.from_batches(batches).to_pandas()
+
+    @cached_property
+    def cube(self):
+        """Pre-aggregated :class:`~dashboard.cube.Cube`, built on first use."""
+        from dashboard.cube import Cube
+
+        return Cube.build(self.frame)
+
+    @cached_property
+    def bitmap_index(self):
+        """:class:`~dashboard.bitmap.BitmapIndex` for the Deep Dive filters."""
+        from dashboard.bitmap import BitmapIndex
+
+        return BitmapIndex(self.frame)
+
+    @cached_property
+    def tensor(self):
+        """:class:`~dashboard.tensor.DemographicTensor` of the age/gender counts."""
+        from dashboard.tensor import DemographicTensor
+
+        return DemographicTensor(self.cube)
+
+    @cached_property
+    def sort_index(self):
+        """:class:`~dashboard.table.SortIndex` for the paginated data tables."""
+        from dashboard.table import SortIndex
+
+        return SortIndex(self.frame)
+
+    @cached_property
+    def gazetteer(self):
+        """:class:`~dashboard.gazetteer.Gazetteer` for the location labels."""
+        from dashboard.gazetteer import Gazetteer
+
+        return Gazetteer(self.cube.cells["location"].cat.categories)
+
+    @property
+    def columns(self):
+        return list(self.frame.columns)
+
+    def categories(self, column):
+        """Sorted values of a categorical column, or ``None`` for a numeric one."""
+        values = self.frame[column]
+        return list(values.cat.categories) if isinstance(values.dtype, pd.CategoricalDtype) else None
+
+    def value_range(self, column):
+        values = self.frame[column]
+        return int(values.min()), int(values.max())
+
+    def summary(self, by, value="Total"):
+        """Per-record sum/mean/max/min of ``value`` for each ``by`` value."""
+        return self.frame.groupby(by, observed=True)[value].agg(["sum", "mean", "max", "min"]).reset_index()
+
+    def table_view(self, selection=None, filters=None, column=None, ascending=True):
+        """:class:`~dashboard.table.TableView` of ``selection`` (all rows if ``None``).
+
+        ``filters`` are per-column table filters (see
+        :func:`dashboard.table.filter_mask`); ``column=None`` keeps frame order.
+        """
+        from dashboard.table import TableView, filter_mask
+
+        mask = filter_mask(self.frame, filters or {})
+        rows = None if selection is None else selection.rows
+        return TableView(self.frame, self.sort_index.order(column, ascending, rows=rows, mask=mask))
+
+    def population_type_encoded(self):
+        """Integer codes in order of first appearance, as the notebooks produced."""
+        codes, _ = pd.factorize(self.frame["Population Type"].astype(str))
+        return pd.Series(codes, index=self.frame.index, name="Population_Type_Encoded")
+
+    def population_type_dummies(self):
+        """One-hot ``PopType_*`` columns derived from Population Type."""
+        return pd.get_dummies(self.frame["Population Type"].astype(str), prefix="PopType")
+
+
+def store_dir(path=DATA_PATH):
+    """Directory holding the partitions and manifest for one source file."""
+    return CACHE_DIR / Path(path).stem
+
+
+def partition_paths(directory, year):
+    """Row-level and cube artifacts of one year partition."""
+    return directory / f"year={year}.parquet", directory / f"year={year}.cube.parquet"
+
+
+def read_manifest(directory):
+    try:
+        manifest = json.loads((directory / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == FORMAT_VERSION else None
+
+
+def write_manifest(directory, manifest):
+    tmp = directory / f"{MANIFEST}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=1))
+    os.replace(tmp, directory / MANIFEST)
+
+
+def dataset_version(partitions):
+    """Content version derived from the per-year partition hashes."""
+    parts = sorted((int(year), meta["rows"], meta["hash"]) for year, meta in partitions.items())
+    raw = f"{FORMAT_VERSION}:{parts}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def is_current(path=DATA_PATH):
+    """Whether the stored partitions reflect the current state of ``path``."""
+    manifest = read_manifest(store_dir(path))
+    if manifest is None:
+        return False
+    stat = os.stat(path)
+    source = manifest["source"]
+    return source["size"] == stat.st_size and source["mtime_ns"] == stat.st_mtime_ns
+
+
+def refresh(path=DATA_PATH, progress=None):
+    """Bring the stored partitions up to date with ``path``.
+
+    Appended rows are detected by checking that the previously ingested bytes
+    are an unchanged prefix of the file; only the appended tail is parsed and
+    only the years it touches are rewritten.  Any other change triggers a full
+    scan, after which only years whose content hash changed are replaced.
+    ``progress`` receives a 0-1 fraction.  Returns a summary dict with the
+    refresh ``mode``, the rewritten ``years`` and the ``rows`` parsed.
+
+    Sessions, the API server and warm-up processes may all call this at once,
+    so the whole refresh runs under a host-wide lock and the manifest is read
+    inside it: a process that waited sees the partitions the previous holder
+    committed instead of appending the same tail again.
+    """
+    from dashboard import ingest
+    from dashboard.shared import file_lock
+
+    directory = store_dir(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    with file_lock(directory / REFRESH_LOCK):
+        manifest = read_manifest(directory)
+        if manifest is not None and is_current(path):
+            return {"mode": "current", "years": [], "rows": 0}
+        result = ingest.append(path, directory, manifest, progress=progress) if manifest else None
+        if result is None:
+            result = ingest.rescan(path, directory, manifest, progress=progress)
+        write_manifest(directory, result["manifest"])
+    return {key: value for key, value in result.items() if key != "manifest"}
+
+
+def read_categorical(target, columns):
+    """Read a Parquet artifact with ``columns`` as lexically sorted categoricals."""
+    return sort_categories(pd.read_parquet(target, read_dictionary=columns), columns)
+
+
+def sort_categories(frame, columns):
+    for col in columns:
+        frame[col] = frame[col].cat.set_categories(sorted(frame[col].cat.categories))
+    return frame
+
+
+def read_frame(paths):
+    """Read and concatenate row-level partitions."""
+    tables = [pq.read_table(path, read_dictionary=CATEGORICAL_COLS) for path in paths]
+    if not tables:
+        tables = [SCHEMA.empty_table()]
+    table = pa.concat_tables(tables).unify_dictionaries()
+    frame = table.to_pandas()
+    return sort_categories(frame.astype({col: "category" for col in CATEGORICAL_COLS}), CATEGORICAL_COLS)
+
+
+def load_dataset(path=DATA_PATH, progress=None):
+    """Load the dataset, refreshing the stored partitions first if they are stale."""
+    from dashboard import shared, sql
+    from dashboard.cube import Cube
+
+    if not is_current(path):
+        refresh(path, progress=progress)
+    directory = store_dir(path)
+    manifest = read_manifest(directory)
+    years = sorted(manifest["partitions"], key=int)
+    paths = [partition_paths(directory, year) for year in years]
+    data_paths = [data for data, _ in paths]
+    if sql.ENABLED:
+        # Rows stay in the database; only the small cube is held in memory
+        cube = Cube.merge([Cube.read(cube) for _, cube in paths])
+        return sql.load(directory, manifest["version"], data_paths, cube)
+    if shared.ENABLED:
+        # Map the host-wide copy, publishing it first if no other process has
+        attached = shared.attach(directory, manifest["version"])
+        if attached is None:
+            cube = Cube.merge([Cube.read(cube) for _, cube in paths])
+            shared.publish(directory, manifest["version"], lambda: read_frame(data_paths), cube)
+            attached = shared.attach(directory, manifest["version"])
+        if attached is not None:
+            frame, cube = attached
+            return Dataset(manifest["version"], partitions=data_paths, frame=frame, cube=cube)
+    cube = Cube.merge([Cube.read(cube) for _, cube in paths])
+    return Dataset(manifest["version"], partitions=data_paths, cube=cube)
@@ -0,0 +1,92 @@
+"""Synthetic demographics data with the schema of the dashboard's CSV.
+
+Rows are generated in chunks so that sizes from 10^3 up to 10^8 rows can be
+written to disk (:func:`write_csv`) without holding them in memory; smaller
+sizes can be built directly as a :class:`~dashboard.store.Dataset`
+(:func:`dataset`).  Output is deterministic for a given ``seed``.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.gazetteer import LOCATION_COORDS
+from dashboard.store import CATEGORICAL_COLS, FEMALE_COLS, MALE_COLS, Dataset, normalize
+
+POPULATION_TYPES = ["ASY", "REF", "IDP", "RET", "RDP"]
+URBAN_RURAL = ["U", "R", "V", "C"]
+ACCOMMODATION = ["U", "C", "I"]
+ORIGINS = ["Afghanistan", "Iraq", "Iran (Islamic Rep. of)", "Myanmar", "Pakistan",
+           "Somalia", "Sri Lanka", "Sudan", "Syrian Arab Rep.", "Yemen"]
+ASYLUM = ["Sri Lanka"]
+YEARS = range(2001, 2024)
+
+CSV_COLUMNS = (
+    ["Year", "Country of Origin Name", "Country of Asylum Name", "Population Type",
+     "location", "urbanRural", "accommodationType"]
+    + FEMALE_COLS + ["Female Total"] + MALE_COLS + ["Male Total", "Total"]
+)
+
+CHUNK_ROWS = 1_000_000
+
+
+def locations(n):
+    """``n`` location labels: real districts, their admin levels, then synthetic ones."""
+    base = [name for name in LOCATION_COORDS]
+    labels = base + [f"{name} : District" for name in base] + [f"{name} : Division" for name in base]
+    labels += [f"Location {i:05d} : Point" for i in range(max(n - len(labels), 0))]
+    return labels[:n]
+
+
+def _chunk(rng, n_rows, year_range, location_labels):
+    years = np.sort(rng.integers(year_range.start, year_range.stop, n_rows)).astype(np.int16)
+    columns = {"Year": years}
+    choices = {
+        "Country of Origin Name": ORIGINS,
+        "Country of Asylum Name": ASYLUM,
+        "Population Type": POPULATION_TYPES,
+        "location": location_labels,
+        "urbanRural": URBAN_RURAL,
+        "accommodationType": ACCOMMODATION,
+    }
+    for col in CATEGORICAL_COLS:
+        labels = choices[col]
+        columns[col] = pd.Categorical.from_codes(rng.integers(0, len(labels), n_rows), labels)
+    # Skewed bucket sizes: most rows are small, a few are very large
+    scale = rng.pareto(1.5, n_rows) * 20
+    for gender_cols, total_col in ((FEMALE_COLS, "Female Total"), (MALE_COLS, "Male Total")):
+        counts = rng.poisson(scale[:, None] * [0.15, 0.2, 0.15, 0.4, 0.08, 0.02]).astype(np.int32)
+        for i, col in enumerate(gender_cols):
+            columns[col] = counts[:, i]
+        columns[total_col] = counts.sum(axis=1, dtype=np.int32)
+    columns["Total"] = columns["Female Total"] + columns["Male Total"]
+    return pd.DataFrame(columns)[CSV_COLUMNS]
+
+
+def iter_chunks(n_rows, seed=0, chunk_rows=CHUNK_ROWS, years=YEARS, n_locations=51):
+    """Yield raw-schema frames totalling ``n_rows`` rows."""
+    rng = np.random.default_rng(seed)
+    labels = locations(n_locations)
+    remaining = int(n_rows)
+    while remaining > 0:
+        size = min(chunk_rows, remaining)
+        yield _chunk(rng, size, years, labels)
+        remaining -= size
+
+
+def generate(n_rows, seed=0, **kwargs):
+    """A raw-schema frame of ``n_rows`` rows held in memory."""
+    chunks = list(iter_chunks(n_rows, seed=seed, **kwargs))
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def write_csv(path, n_rows, seed=0, **kwargs):
+    """Stream ``n_rows`` synthetic rows to a CSV file at ``path``."""
+    with open(path, "w", newline="") as fh:
+        for i, chunk in enumerate(iter_chunks(n_rows, seed=seed, **kwargs)):
+            chunk.to_csv(fh, index=False, header=i == 0)
+    return path
+
+
+def dataset(n_rows, seed=0, **kwargs):
+    """An in-memory :class:`~dashboard.store.Dataset` of ``n_rows`` synthetic rows."""
+    frame = normalize(generate(n_rows, seed=seed, **kwargs))
+    return Dataset(f"synthetic-{int(n_rows)}-{seed}", frame=frame)
@@ -0,0 +1,105 @@
+"""Server-side sorting, filtering and paging for the data tables.
+
+:class:`SortIndex` holds one stable sort permutation per column and
+direction, computed on first use and shared by every session.  A table view
+is an ordered array of row positions: the permutation restricted to the
+selected rows with a boolean mask, so sorting a selection never re-sorts the
+frame.  Only the requested page of positions is materialized with ``take``.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class SortIndex:
+    """Lazily computed stable sort permutations of a frame's columns."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.size = len(frame)
+        self._perms = {}
+        self._lock = threading.Lock()
+
+    def _sort_keys(self, column):
+        values = self.frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            return values.cat.codes.to_numpy()
+        return values.to_numpy()
+
+    def permutation(self, column, ascending=True):
+        """Row positions of the frame ordered by ``column``; ties keep frame order."""
+        key = (column, ascending)
+        perm = self._perms.get(key)
+        if perm is None:
+            keys = self._sort_keys(column)
+            if ascending:
+                perm = np.argsort(keys, kind="stable")
+            else:
+                # Stable descending order: sort the reversed keys and map positions back
+                perm = self.size - 1 - np.argsort(keys[::-1], kind="stable")[::-1]
+            with self._lock:
+                perm = self._perms.setdefault(key, perm)
+        return perm
+
+    def order(self, column=None, ascending=True, rows=None, mask=None):
+        """Positions of the selected rows in display order.
+
+        ``rows`` restricts to a set of row positions (all rows when ``None``)
+        and ``mask`` is an optional boolean array over the whole frame, such as
+        the result of :func:`filter_mask`.
+        """
+        if rows is not None:
+            selected = np.zeros(self.size, dtype=bool)
+            selected[rows] = True
+            mask = selected if mask is None else selected & mask
+        if column is None:
+            positions = np.arange(self.size) if mask is None else np.flatnonzero(mask)
+            return positions if ascending else positions[::-1]
+        perm = self.permutation(column, ascending)
+        return perm if mask is None else perm[mask[perm]]
+
+
+class TableView:
+    """Rows of a table in display order, as positions into ``frame``."""
+
+    def __init__(self, frame, positions):
+        self.frame = frame
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def page(self, number, size):
+        """Rows of 1-based page ``number``."""
+        return page(self.frame, self.positions, number, size)
+
+
+def filter_mask(frame, filters):
+    """Boolean row mask for per-column ``filters``, or ``None`` if there are none.
+
+    A filter is a list of allowed values for a categorical column or an
+    inclusive ``(low, high)`` range for a numeric one.
+    """
+    mask = None
+    for col, spec in filters.items():
+        values = frame[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.categories.get_indexer(list(spec))
+            keep = np.isin(values.cat.codes.to_numpy(), codes[codes >= 0])
+        else:
+            low, high = spec
+            array = values.to_numpy()
+            keep = (array >= low) & (array <= high)
+        mask = keep if mask is None else mask & keep
+    return mask
+
+
+def page(frame, positions, number, size):
+    """Rows of 1-based page ``number`` of ``positions``."""
+    start = (number - 1) * size
+    return frame.take(positions[start:start + size])
+
+
+def page_count(n_rows, size):
+    return max((n_rows + size - 1) // size, 1)
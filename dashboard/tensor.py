@@ -0,0 +1,88 @@
+"""Dense age/gender count tensor for the Demographics page.
+
+The cube's age-bucket columns are scattered once per dataset version into a
+NumPy array indexed by [year, population type, location, urbanRural, gender,
+age bucket].  Page queries select positions along the filtered axes and sum
+out the rest, so their cost depends on the tensor's shape, not on the number
+of records.  Marginals over summed-out axes are memoized, so repeated queries
+touch only the small reduced arrays.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dashboard.store import AGE_GROUPS, FEMALE_COLS, MALE_COLS
+
+AXES = ("Year", "Population Type", "location", "urbanRural", "gender", "age")
+GENDERS = ["Male", "Female"]
+GENDER_AGE_COLS = [MALE_COLS, FEMALE_COLS]
+
+
+class DemographicTensor:
+    """Age/gender counts as a dense array over :data:`AXES`."""
+
+    def __init__(self, cube):
+        cells = cube.cells
+        self.labels = {}
+        codes = []
+        for axis in AXES[:4]:
+            values = cells[axis]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.cat.remove_unused_categories()
+                self.labels[axis] = pd.Index(values.cat.categories)
+                codes.append(values.cat.codes.to_numpy())
+            else:
+                axis_codes, labels = pd.factorize(values, sort=True)
+                self.labels[axis] = pd.Index(labels)
+                codes.append(axis_codes)
+        self.labels["gender"] = pd.Index(GENDERS)
+        self.labels["age"] = pd.Index(AGE_GROUPS)
+        self.shape = tuple(len(self.labels[axis]) for axis in AXES)
+
+        # Scatter each age/gender column into the dense array; accommodationType is summed out
+        cell_shape = self.shape[:4]
+        flat = np.ravel_multi_index(codes, cell_shape) if len(cells) else np.zeros(0, dtype=np.intp)
+        size = int(np.prod(cell_shape))
+        counts = np.zeros(self.shape, dtype=np.int64)
+        for g, cols in enumerate(GENDER_AGE_COLS):
+            for a, col in enumerate(cols):
+                weights = cells[col].to_numpy(dtype=np.float64)
+                counts[..., g, a] = np.bincount(flat, weights=weights, minlength=size).reshape(cell_shape)
+        self.counts = counts
+        self._marginals = {}
+        self._lock = threading.Lock()
+
+    def marginal(self, axes):
+        """Counts summed over every axis not in ``axes`` (kept in :data:`AXES` order)."""
+        keep = tuple(axis for axis in AXES if axis in axes)
+        result = self._marginals.get(keep)
+        if result is None:
+            summed = tuple(i for i, axis in enumerate(AXES) if axis not in keep)
+            result = self.counts.sum(axis=summed)
+            with self._lock:
+                result = self._marginals.setdefault(keep, result)
+        return result
+
+    def positions(self, axis, values):
+        if np.ndim(values) == 0:
+            values = [values]
+        found = self.labels[axis].get_indexer(list(values))
+        return found[found >= 0]
+
+    def reduce(self, filters=None, keep=("gender", "age")):
+        """Counts over the ``keep`` axes after restricting the ``filters`` axes.
+
+        ``filters`` maps an axis to a value or list of values, like the cube's
+        filters; ``None`` means no restriction.
+        """
+        filters = {axis: values for axis, values in (filters or {}).items() if values is not None}
+        counts = self.marginal(set(keep) | set(filters))
+        kept = [axis for axis in AXES if axis in keep or axis in filters]
+        for axis, values in filters.items():
+            counts = counts.take(self.positions(axis, values), axis=kept.index(axis))
+        summed = tuple(i for i, axis in enumerate(kept) if axis not in keep)
+        counts = counts.sum(axis=summed)
+        # Return the kept axes in the order they were requested
+        order = [axis for axis in kept if axis in keep]
+        return np.moveaxis(counts, [order.index(axis) for axis in keep], range(len(keep)))
@@ -0,0 +1,224 @@
+"""Per-rerun tracing spans for the dashboard pages.
+
+``app.py`` opens a :class:`Trace` for each script run when tracing is on,
+either for every session (``DASHBOARD_TRACE=1``) or for a session that
+enabled the sidebar "Performance" panel.  Code anywhere below it records
+stages with :func:`span` or the :func:`traced` decorator; each span carries
+its wall time and, where known, a row count and a size in bytes.  With no
+active trace both return immediately, so instrumentation stays in place at
+negligible cost.
+
+Finished traces are appended as JSON lines to ``.cache/trace.jsonl`` and kept
+in a bounded in-process history for the panel.  Aggregate p50/p95 per page
+and stage across sessions with ``python -m dashboard.tracing``.
+"""
+import contextvars
+import functools
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+from dashboard.store import CACHE_DIR
+
+LOG_PATH = CACHE_DIR / "trace.jsonl"
+ENABLED = os.environ.get("DASHBOARD_TRACE", "") not in ("", "0")
+
+_current = contextvars.ContextVar("trace", default=None)
+_history = deque(maxlen=2000)
+_lock = threading.Lock()
+
+
+def session_id():
+    return uuid.uuid4().hex[:8]
+
+
+class Span:
+    __slots__ = ("stage", "start", "ms", "rows", "bytes", "meta")
+
+    def __init__(self, stage, rows=None, nbytes=None, **meta):
+        self.stage = stage
+        self.rows = rows
+        self.bytes = nbytes
+        self.meta = meta
+        self.start = time.perf_counter()
+        self.ms = None
+
+    def set(self, rows=None, nbytes=None, **meta):
+        """Attach sizes known only once the stage has run."""
+        if rows is not None:
+            self.rows = rows
+        if nbytes is not None:
+            self.bytes = nbytes
+        self.meta.update(meta)
+
+    def as_dict(self):
+        entry = {"stage": self.stage, "ms": self.ms, "rows": self.rows, "bytes": self.bytes}
+        entry.update(self.meta)
+        return entry
+
+
+class _NullSpan:
+    """Stand-in returned by :func:`span` when nothing is being traced."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, rows=None, nbytes=None, **meta):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _SpanContext:
+    __slots__ = ("trace", "span")
+
+    def __init__(self, trace, span):
+        self.trace = trace
+        self.span = span
+
+    def __enter__(self):
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc):
+        self.span.ms = round((time.perf_counter() - self.span.start) * 1000, 3)
+        self.trace.spans.append(self.span)
+        return False
+
+
+class Trace:
+    """The spans recorded during one script run of one page."""
+
+    def __init__(self, page, session=None):
+        self.page = page
+        self.session = session or session_id()
+        self.ts = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.total_ms = None
+
+    def span(self, stage, rows=None, nbytes=None, **meta):
+        return _SpanContext(self, Span(stage, rows, nbytes, **meta))
+
+    def as_dict(self):
+        return {
+            "ts": self.ts,
+            "pid": os.getpid(),
+            "session": self.session,
+            "page": self.page,
+            "total_ms": self.total_ms,
+            "spans": [span.as_dict() for span in self.spans],
+        }
+
+
+def start(page, session=None, enabled=True):
+    """Begin tracing this run and return its :class:`Trace`, or ``None`` if not ``enabled``.
+
+    Always call at the top of a run so a trace left open by a run that raised
+    is dropped rather than collecting spans from later runs.
+    """
+    trace = Trace(page, session) if enabled else None
+    _current.set(trace)
+    return trace
+
+
+def finish(trace, log_path=LOG_PATH):
+    """End ``trace``, append it to the log and the in-process history."""
+    _current.set(None)
+    trace.total_ms = round((time.perf_counter() - trace.start) * 1000, 3)
+    entry = trace.as_dict()
+    line = json.dumps(entry, default=str) + "\n"
+    with _lock:
+        _history.append(entry)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "a") as fh:
+            fh.write(line)
+    return entry
+
+
+def span(stage, rows=None, nbytes=None, **meta):
+    """Context manager timing ``stage`` in the active trace, if any."""
+    trace = _current.get()
+    if trace is None:
+        return NULL_SPAN
+    return trace.span(stage, rows, nbytes, **meta)
+
+
+def traced(func=None, stage=None):
+    """Decorator recording each call as a span with the result's row count."""
+    if func is None:
+        return functools.partial(traced, stage=stage)
+    name = stage or f"{func.__module__.rsplit('.', 1)[-1]}:{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        trace = _current.get()
+        if trace is None:
+            return func(*args, **kwargs)
+        with trace.span(name) as s:
+            result = func(*args, **kwargs)
+            s.set(rows=size_of(result))
+        return result
+
+    return wrapper
+
+
+def size_of(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def frame_bytes(frame):
+    """In-memory size of a DataFrame, the payload Streamlit serializes for it."""
+    return int(frame.memory_usage(index=True, deep=False).sum())
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty sequence."""
+    values = sorted(values)
+    rank = max(math.ceil(q / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def aggregate(entries):
+    """p50/p95 of run and stage times keyed by (page, stage); stage ``total`` is the run."""
+    samples = {}
+    for entry in entries:
+        samples.setdefault((entry["page"], "total"), []).append(entry["total_ms"])
+        per_stage = {}
+        for s in entry["spans"]:
+            per_stage[s["stage"]] = per_stage.get(s["stage"], 0.0) + s["ms"]
+        for stage, ms in per_stage.items():
+            samples.setdefault((entry["page"], stage), []).append(ms)
+    return {
+        key: {"runs": len(ms), "p50_ms": percentile(ms, 50), "p95_ms": percentile(ms, 95)}
+        for key, ms in sorted(samples.items())
+    }
+
+
+def history(page=None):
+    """Traces finished in this process, optionally for one page."""
+    with _lock:
+        entries = list(_history)
+    return [e for e in entries if page is None or e["page"] == page]
+
+
+def read_log(log_path=LOG_PATH):
+    with open(log_path) as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+if __name__ == "__main__":
+    for (page, stage), stats in aggregate(read_log()).items():
+        print(f"{page:<12} {stage:<40} {stats['runs']:>6} runs  "
+              f"p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms")
@@ -0,0 +1,6 @@
+"""Dashboard pages, each exposing ``render(dataset, figures)``.
+
+Page modules are imported on first use through
+:func:`dashboard.startup.import_view`, so a session only pays for the
+plotting and mapping libraries of the pages it actually visits.
+"""
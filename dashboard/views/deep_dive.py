@@ -0,0 +1,104 @@
+"""Deep Dive Explorer page: ad-hoc filters, summaries and the data table."""
+import streamlit as st
+
+from dashboard import compute, export, tracing
+from dashboard.views.sections import section
+from dashboard.views.table import render_table
+
+
+def render(dataset, figures):
+    st.title("🔍 Deep-Dive Explorer")
+    st.markdown("Apply filters to explore population data in detail. Insights are useful for targeted government decision-making.")
+
+    # Sub-tabs inside Deep Dive
+    deep_dive_tabs = st.tabs(["Filters & Visuals", "Summary Stats", "Subgroup Comparison", "Data Table"])
+
+    # --- TAB 1: Filters & Visuals --- #
+    with deep_dive_tabs[0]:
+        st.header("📊 Interactive Visuals")
+        col1, col2, col3, col4 = st.columns(4)
+
+        index = dataset.bitmap_index
+        with col1:
+            selected_year = st.selectbox("Year", ["All"] + list(index.labels["Year"]))
+        with col2:
+            selected_gender = st.selectbox("Gender", ["All", "Male", "Female"])
+        with col3:
+            selected_urban_rural = st.selectbox("Urban/Rural", ["All"] + list(index.labels["urbanRural"]))
+        with col4:
+            selected_pop_type = st.selectbox("Population Type", ["All"] + list(index.labels["Population Type"]))
+
+        selected_location = st.multiselect("Location", options=list(index.labels["location"]), default=None)
+
+        # Apply filters by intersecting precomputed row bitmaps
+        dd_filters = {
+            "Year": None if selected_year == "All" else selected_year,
+            "urbanRural": None if selected_urban_rural == "All" else selected_urban_rural,
+            "Population Type": None if selected_pop_type == "All" else selected_pop_type,
+            "location": selected_location or None,
+        }
+        dd_nonzero = [] if selected_gender == "All" else [f"{selected_gender} Total"]
+        selection = compute.deep_dive_selection(dataset, dd_filters, dd_nonzero)
+
+        # KPI: Total matching population
+        total_pop = selection.sum("Total")
+        st.metric("Total Matching Population", f"{int(total_pop):,}")
+
+        # Visual: Bar Chart
+        chart_section(dataset, figures, dd_filters, dd_nonzero)
+
+    # --- TAB 2: Summary Stats --- #
+    with deep_dive_tabs[1]:
+        st.header("📈 Summary Statistics")
+        st.markdown("Breakdown of key metrics by category.")
+        summary = compute.population_type_summary(dataset)
+        st.dataframe(summary.style.format({"sum": "{:,}", "mean": "{:.0f}", "max": "{:,}", "min": "{:,}"}))
+
+    # --- TAB 3: Subgroup Comparison --- #
+    with deep_dive_tabs[2]:
+        st.header("🔍 Subgroup Comparison")
+        st.markdown("Compare two filters side by side.")
+        subgroup_section(dataset, figures)
+
+    # --- TAB 4: Data Table --- #
+    with deep_dive_tabs[3]:
+        st.header("📋 Filtered Data Table")
+        render_table(dataset, selection=selection, key="dd_table")
+
+        export_section(dataset, {"filters": dd_filters, "nonzero": dd_nonzero}, selection)
+
+
+@section
+def chart_section(dataset, figures, dd_filters, dd_nonzero):
+    chart_type = st.radio("Choose Chart Type", ["Bar Chart", "Line Chart"])
+    group_by_col = st.selectbox("Group By", ["Year", "location", "Population Type", "urbanRural"],
+                              help="Selecting 'Year' for line chart will show overall trend")
+
+    fig = figures.figure(dataset, "deep_dive_chart", filters=dd_filters, nonzero=dd_nonzero,
+                         chart_type=chart_type, group_by_col=group_by_col)
+    with tracing.span("render:chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@section
+def subgroup_section(dataset, figures):
+    compare_col1 = st.selectbox("First Category", ["urbanRural", "location", "Population Type"])
+    compare_col2 = st.selectbox("Second Category", ["Year", "Population Type", "location"])
+
+    fig = figures.figure(dataset, "subgroup_comparison", compare_col1=compare_col1, compare_col2=compare_col2)
+    with tracing.span("render:chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@section
+def export_section(dataset, export_state, selection):
+    # The file is generated (or read from the export cache) only when the button is clicked
+    export_format = st.radio("Export format", list(export.FORMATS), horizontal=True)
+    suffix, mime = export.FORMATS[export_format]
+    st.download_button(
+        f"Download {export_format}",
+        data=lambda: export.export(dataset, export_state, selection, export_format).read_bytes(),
+        file_name=f"filtered_population_data{suffix}",
+        mime=mime,
+        on_click="ignore",
+    )
@@ -0,0 +1,54 @@
+"""Demographics page: gender and age breakdowns."""
+import streamlit as st
+
+from dashboard import tracing
+from dashboard.figures import PIE_MODES
+from dashboard.views.sections import section
+
+
+def render(dataset, figures):
+    cube = dataset.cube
+
+    st.subheader("👥 Demographics by Age and Gender")
+
+    # --- Filters --- #
+    years = cube.values('Year')
+    population_types = cube.values('Population Type')
+
+    # Changed to multiselect
+    selected_years = st.sidebar.multiselect("Select Year(s)", years, default=[years[-1]])
+    selected_pop_types = st.sidebar.multiselect("Select Population Type(s)", population_types, default=[population_types[0]])
+
+    # --- Radio Buttons for Pie Charts --- #
+    st.markdown("### 👤 Gender & Age Distribution Overview")
+    pie_section(dataset, figures, selected_years, selected_pop_types)
+
+    # --- Stacked Bar Chart --- #
+    st.markdown("### 📊 Stacked Bar Chart: Population by Age & Gender")
+    fig_bar = figures.figure(dataset, "demographics_stacked", years=selected_years, pop_types=selected_pop_types)
+    with tracing.span("render:chart"):
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+    # --- Gender and Population Type Relationship --- #
+    st.markdown("### 🔍 Gender and Population Type Relationship")
+    relation_section(dataset, figures, years, population_types)
+
+    st.markdown("This chart highlights the relationship between gender, age groups, and different population types across selected years.")
+
+
+@section
+def pie_section(dataset, figures, selected_years, selected_pop_types):
+    chart_mode = st.radio("Choose View", PIE_MODES, horizontal=True)
+    fig = figures.figure(dataset, "demographics_pie", years=selected_years, pop_types=selected_pop_types, mode=chart_mode)
+    with tracing.span("render:chart"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@section
+def relation_section(dataset, figures, years, population_types):
+    selected_years_relation = st.multiselect("Select Year(s)", years, default=years)
+    selected_pop_type_radio = st.radio("Select Population Type", population_types)
+
+    fig_combo = figures.figure(dataset, "demographics_relation", years=selected_years_relation, pop_type=selected_pop_type_radio)
+    with tracing.span("render:chart"):
+        st.plotly_chart(fig_combo, use_container_width=True)
@@ -0,0 +1,31 @@
+"""Geographic Distribution page: location map and top locations."""
+import streamlit as st
+from streamlit_folium import st_folium
+
+from dashboard import compute, tracing
+from dashboard.gazetteer import population_map
+
+
+def render(dataset, figures):
+    cube = dataset.cube
+
+    st.subheader("🌍 Geographic Distribution")
+
+    # Sidebar filters
+    years = cube.values('Year')
+    population_types = cube.values('Population Type')
+    selected_years = st.sidebar.multiselect("Select Year(s)", years, default=years)
+    selected_pop_types = st.sidebar.multiselect("Select Population Type(s)", population_types, default=population_types)
+
+    # Location totals folded onto gazetteer names
+    location_data = compute.location_totals(dataset, selected_years, selected_pop_types)
+
+    # Single GeoJSON marker layer; map interactions don't need to trigger reruns
+    st.markdown("### 📍 Population Distribution by Location")
+    with tracing.span("render:map", rows=len(location_data)):
+        st_folium(population_map(location_data), width=700, height=500, returned_objects=[])
+
+    st.markdown("### 📊 Top 10 Locations by Total Population")
+    fig = figures.figure(dataset, "geo_top_locations", years=selected_years, pop_types=selected_pop_types)
+    with tracing.span("render:chart"):
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,61 @@
+"""Overview page: introduction, KPI cards and dataset preview."""
+import streamlit as st
+
+from dashboard import compute, tracing
+from dashboard.views.sections import section
+from dashboard.views.table import render_table
+
+
+def render(dataset, figures):
+    kpis = compute.overview_kpis(dataset)
+
+    st.title("📊 Population Demographics Dashboard - Sri Lanka")
+    st.subheader("Overview & Introduction")
+
+    st.markdown("""
+    **Welcome to the Sri Lanka Population Demographics Dashboard.**  
+    This dashboard presents a comprehensive overview of displaced and affected populations residing in Sri Lanka, 
+    including refugees, asylum seekers, internally displaced persons (IDPs), and other categories.
+
+    The data spans from **2001 to the most recent available year**, covering diverse geographic locations and demographic 
+    breakdowns such as gender, age, and living conditions (urban/rural).
+    """)
+
+    # KPI Cards
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.markdown(f"""
+            <div style="padding: 20px; background-color: #f0f0f5; border-radius: 10px; font-size: 20px; 
+                        font-weight: bold; text-align: center; color: #005c99; height: 150px;">
+                Total Population Records<br><span style="font-size: 30px;">{kpis['total']:,}</span>
+            </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        st.markdown(f"""
+            <div style="padding: 20px; background-color: #f0f0f5; border-radius: 10px; font-size: 20px; 
+                        font-weight: bold; text-align: center; color: #005c99; height: 150px;">
+                Unique Population Types<br><span style="font-size: 30px;">{kpis['population_types']}</span>
+            </div>
+        """, unsafe_allow_html=True)
+    with col3:
+        st.markdown(f"""
+            <div style="padding: 20px; background-color: #f0f0f5; border-radius: 10px; font-size: 20px; 
+                        font-weight: bold; text-align: center; color: #005c99; height: 150px;">
+                Gender Ratio (F:M)<br><span style="font-size: 30px;">{kpis['female']:.0f}:{kpis['male']:.0f}</span>
+            </div>
+        """, unsafe_allow_html=True)
+
+    # ---- Dataset Preview ---- #
+    st.markdown("### 📋 Dataset Preview")
+    preview_section(dataset)
+
+
+@section
+def preview_section(dataset):
+    show_full = st.checkbox("Show full dataset", value=False)
+    if show_full:
+        render_table(dataset, key="overview_table")
+    else:
+        preview = dataset.head(20)
+        with tracing.span("render:table", rows=len(preview), nbytes=tracing.frame_bytes(preview)):
+            st.dataframe(preview)
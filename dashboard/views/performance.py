@@ -0,0 +1,29 @@
+"""Sidebar "Performance" panel: spans of the last run, p50/p95 per stage and figure cache counters."""
+import pandas as pd
+import streamlit as st
+
+from dashboard import tracing
+
+
+def render_panel(entry, figures=None):
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.metric("Last run", f"{entry['total_ms']:,.0f} ms")
+        spans = pd.DataFrame(entry["spans"], columns=["stage", "ms", "rows", "bytes", "cached"])
+        st.dataframe(spans, hide_index=True)
+
+        # Aggregated over every session served by this process
+        history = tracing.history(entry["page"])
+        stats = tracing.aggregate(history)
+        summary = pd.DataFrame(
+            [{"stage": stage, **values} for (_, stage), values in stats.items()],
+            columns=["stage", "runs", "p50_ms", "p95_ms"],
+        )
+        st.caption(f"{entry['page']}: p50/p95 over {len(history)} runs in this process")
+        st.dataframe(summary, hide_index=True)
+
+        if figures is not None:
+            cache = figures.stats()
+            st.caption(f"Figure cache: {cache['entries']} entries, {cache['bytes'] / 1e6:,.1f} MB")
+            hits, evictions = st.columns(2)
+            hits.metric("Hit rate", f"{cache['hit_rate']:.0%}", help=f"{cache['hits']} hits, {cache['misses']} misses")
+            evictions.metric("Evictions", f"{cache['evictions']:,}")
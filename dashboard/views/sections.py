@@ -0,0 +1,42 @@
+"""Page sections that rerun on their own.
+
+:func:`section` wraps ``st.fragment``: when a widget inside a section
+changes, Streamlit re-executes only that section, reusing the page's
+already-computed state (dataset, filters, figure cache) instead of rerunning
+``app.py`` from the top.  Such partial reruns are traced as their own entry,
+named ``<page>#<section>``, since the full-run trace has already finished.
+
+Sections cannot write to the sidebar, so sidebar filters stay in the page
+body and are passed in as arguments.
+"""
+import functools
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from dashboard import tracing
+
+
+def _partial_rerun():
+    ctx = get_script_run_ctx()
+    return bool(ctx is not None and ctx.fragment_ids_this_run)
+
+
+def section(func):
+    """Decorator turning a page section into a Streamlit fragment."""
+    page = func.__module__.rsplit(".", 1)[-1]
+
+    @st.fragment
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _partial_rerun():
+            return func(*args, **kwargs)
+        trace = tracing.start(f"{page}#{func.__name__}", st.session_state.get("trace_session"),
+                              enabled=tracing.ENABLED or st.session_state.get("perf_panel", False))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if trace is not None:
+                tracing.finish(trace)
+
+    return wrapper
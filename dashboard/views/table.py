@@ -0,0 +1,59 @@
+"""Paginated data table shared by the Overview and Deep Dive pages.
+
+Sorting, column filters and paging run on the server through the dataset's
+:meth:`~dashboard.store.Dataset.table_view`: in memory via
+:mod:`dashboard.table`, or as SQL with :mod:`dashboard.sql`.  Only the
+visible page of rows is sent to the browser.  The table is a
+:func:`~dashboard.views.sections.section`, so sorting or paging reruns only
+the table.
+"""
+import streamlit as st
+
+from dashboard import table, tracing
+from dashboard.views.sections import section
+
+PAGE_SIZES = [25, 50, 100, 500]
+ORIGINAL_ORDER = "(original order)"
+
+
+@section
+def render_table(dataset, selection=None, key="table"):
+    """Show ``dataset`` rows (or just those in ``selection``) one page at a time."""
+    columns = dataset.columns
+
+    with st.expander("Sort & filter"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sort_col = st.selectbox("Sort by", [ORIGINAL_ORDER] + columns, key=f"{key}_sort")
+        with col2:
+            ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True,
+                                 key=f"{key}_order") == "Ascending"
+        with col3:
+            page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_size")
+
+        filters = {}
+        for col in st.multiselect("Filter columns", columns, key=f"{key}_filter_cols"):
+            categories = dataset.categories(col)
+            if categories is not None:
+                filters[col] = st.multiselect(col, categories, default=categories, key=f"{key}_f_{col}")
+            else:
+                low, high = dataset.value_range(col)
+                if low < high:
+                    filters[col] = st.slider(col, low, high, (low, high), key=f"{key}_f_{col}")
+
+    with tracing.span("table:order") as span:
+        view = dataset.table_view(selection, filters, None if sort_col == ORIGINAL_ORDER else sort_col, ascending)
+        span.set(rows=len(view))
+
+    # Keep the page number valid when filters shrink the result
+    pages = table.page_count(len(view), page_size)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    number = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=page_key)
+
+    visible = view.page(number, page_size)
+    start = (number - 1) * page_size
+    st.caption(f"Rows {min(start + 1, len(view)):,}–{start + len(visible):,} of {len(view):,}")
+    with tracing.span("render:table", rows=len(visible), nbytes=tracing.frame_bytes(visible)):
+        st.dataframe(visible)
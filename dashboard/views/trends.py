@@ -0,0 +1,66 @@
+"""Population Type Trends page: trends, composition and growth metrics."""
+import streamlit as st
+
+from dashboard import compute, tracing
+
+
+def render(dataset, figures):
+    cube = dataset.cube
+
+    st.subheader("📈 Population Type Trends")
+    
+    # Sidebar filters
+    years = cube.values('Year')
+    population_types = cube.values('Population Type')
+    selected_years = st.sidebar.multiselect("Select Year(s)", years, default=years)
+    selected_pop_types = st.sidebar.multiselect("Select Population Type(s)", population_types, default=population_types)
+    trend_state = {'years': selected_years, 'pop_types': selected_pop_types}
+    
+    # Create tabs for organized viewing
+    tab1, tab2, tab3 = st.tabs(["Trend Analysis", "Composition", "Advanced Metrics"])
+    
+    with tab1:
+        # 1. Main Trend Lines with Annotations
+        st.markdown("### 📊 Population Type Trends Over Time")
+        fig = figures.figure(dataset, "trends_annotated", **trend_state)
+        with tracing.span("render:chart"):
+            st.plotly_chart(fig, use_container_width=True)
+        
+        # 2. Small Multiples Trend View
+        st.markdown("### 🔍 Individual Trend Lines (with 3-year rolling mean)")
+        fig_small = figures.figure(dataset, "trends_small_multiples", **trend_state)
+        with tracing.span("render:chart"):
+            st.plotly_chart(fig_small, use_container_width=True)
+    
+    with tab2:
+        # 3. Stacked Area Composition Chart
+        st.markdown("### 🧩 Population Composition Over Time")
+        fig_area = figures.figure(dataset, "trends_area", **trend_state)
+        with tracing.span("render:chart"):
+            st.plotly_chart(fig_area, use_container_width=True)
+        
+        # 4. Percentage Composition Heatmap
+        st.markdown("### 🔢 Percentage Composition Heatmap")
+        fig_heat = figures.figure(dataset, "trends_heatmap", **trend_state)
+        with tracing.span("render:chart"):
+            st.plotly_chart(fig_heat, use_container_width=True)
+    
+    with tab3:
+        # 5. Growth Rate Analysis
+        st.markdown("### 📈 Annual Growth Rates")
+        fig_growth = figures.figure(dataset, "trends_growth", **trend_state)
+        with tracing.span("render:chart"):
+            st.plotly_chart(fig_growth, use_container_width=True)
+        
+        # 6. Statistical Summary
+        st.markdown("### 📊 Statistical Summary")
+        stats = compute.trend_stats(compute.trend_data(dataset, **trend_state))
+
+        st.dataframe(stats.style.format({
+            'mean': '{:,.0f}',
+            'median': '{:,.0f}',
+            'std': '{:,.1f}',
+            'min': '{:,.0f}',
+            'max': '{:,.0f}',
+            'CAGR (%)': '{:.1f}%'
+        }))
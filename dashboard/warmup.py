@@ -0,0 +1,241 @@
+"""Warm the figure cache with the default views of every page.
+
+:func:`warm` builds the figures for :func:`default_states` (plus any extra
+states listed in the JSON file named by ``DASHBOARD_WARMUP_FILE``) in a
+process pool.  Each worker attaches to the host-wide dataset, builds its
+share of figures and returns their JSON, which the parent stores in the
+:class:`~dashboard.cache.FigureCache`.
+
+The built payloads are also saved next to the dataset partitions, so a
+server started after ``python -m dashboard.warmup`` (e.g. in a deploy step)
+seeds its cache from disk before the first session arrives.  ``app.py``
+calls :func:`start` once per dataset version: it loads that seed, or builds
+the per-process structures (cube, bitmap index, tensor, gazetteer) while a
+child process runs the warm-up, then loads the seed the child leaves.  The
+command holds a host-wide lock while it warms, so several servers starting
+at once build each seed only once; the others find it current and skip.
+Every run appends its duration to ``.cache/warmup.jsonl``.  Set ``DASHBOARD_WARMUP=0`` to disable.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dashboard import store
+from dashboard.cache import FigureCache
+from dashboard.shared import file_lock
+
+ENABLED = os.environ.get("DASHBOARD_WARMUP", "1") != "0"
+EXTRA_FILE = os.environ.get("DASHBOARD_WARMUP_FILE")
+LOG_PATH = store.CACHE_DIR / "warmup.jsonl"
+SEED_DIR = "warm"
+LOCK_FILE = "warm.lock"
+
+# Per-dataset structures the server builds while the child warms its figures
+STRUCTURES = ("cube", "bitmap_index", "tensor", "gazetteer")
+
+_worker_dataset = None
+
+
+def default_states(dataset):
+    """(figure builder, state) pairs matching each page's initial widget values."""
+    from dashboard.figures import PIE_MODES
+
+    cube = dataset.cube
+    years = cube.values("Year")
+    pop_types = cube.values("Population Type")
+    everything = {"years": years, "pop_types": pop_types}
+    latest = {"years": [years[-1]], "pop_types": [pop_types[0]]}
+    states = [("geo_top_locations", everything)]
+    states += [(name, everything) for name in (
+        "trends_annotated", "trends_small_multiples", "trends_area", "trends_heatmap", "trends_growth",
+    )]
+    states += [("demographics_pie", {**latest, "mode": mode}) for mode in PIE_MODES]
+    states.append(("demographics_stacked", latest))
+    states.append(("demographics_relation", {"years": years, "pop_type": pop_types[0]}))
+    no_filters = {"Year": None, "urbanRural": None, "Population Type": None, "location": None}
+    states += [
+        ("deep_dive_chart", {"filters": no_filters, "nonzero": [], "chart_type": chart_type, "group_by_col": "Year"})
+        for chart_type in ("Bar Chart", "Line Chart")
+    ]
+    states.append(("subgroup_comparison", {"compare_col1": "urbanRural", "compare_col2": "Year"}))
+    return states
+
+
+def extra_states(path=EXTRA_FILE):
+    """Popular states from a JSON list of ``{"figure": name, "state": {...}}`` objects."""
+    if not path:
+        return []
+    with open(path) as fh:
+        return [(entry["figure"], entry["state"]) for entry in json.load(fh)]
+
+
+def seed_path(version, path=store.DATA_PATH):
+    return store.store_dir(path) / SEED_DIR / f"{version}.jsonl"
+
+
+def lock_path(path=store.DATA_PATH):
+    return store.store_dir(path) / SEED_DIR / LOCK_FILE
+
+
+def _init_worker(path):
+    global _worker_dataset
+    _worker_dataset = store.load_dataset(path)
+
+
+def _build(name, state):
+    from dashboard import figures
+
+    fig = getattr(figures, name)(_worker_dataset, **state)
+    return _worker_dataset.version, name, state, fig.to_json()
+
+
+def warm(dataset, cache, path=store.DATA_PATH, states=None, workers=None, progress=None):
+    """Build missing figures for ``states`` in a process pool and store them in ``cache``.
+
+    ``progress`` receives ``(done, total)`` after each figure.  Returns a
+    summary with the number of figures built and the duration.
+    """
+    start = time.perf_counter()
+    if states is None:
+        states = default_states(dataset) + extra_states()
+    todo = [(name, state) for name, state in states if cache.key(dataset, name, state) not in cache]
+    built = []
+    if todo:
+        workers = workers or min(len(todo), os.cpu_count() or 1)
+        # spawn: forking a threaded server process is unsafe
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(str(path),)) as pool:
+            futures = [pool.submit(_build, name, state) for name, state in todo]
+            for done, future in enumerate(as_completed(futures), 1):
+                version, name, state, payload = future.result()
+                # Skip figures a worker built from a newer source file
+                if version == dataset.version:
+                    cache.put(cache.key(dataset, name, state), payload)
+                    built.append({"figure": name, "state": state, "payload": payload})
+                if progress is not None:
+                    progress(done, len(todo))
+    if built:
+        save_seed(dataset.version, built, path)
+    summary = {
+        "ts": time.time(),
+        "version": dataset.version,
+        "figures": len(built),
+        "cached": len(states) - len(todo),
+        "workers": workers or 0,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOG_PATH, "a") as fh:
+        fh.write(json.dumps(summary) + "\n")
+    return summary
+
+
+def save_seed(version, entries, path=store.DATA_PATH):
+    target = seed_path(version, path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as fh:
+        for entry in entries:
+            fh.write(json.dumps(entry, default=str) + "\n")
+    os.replace(tmp, target)
+    # Seeds of older versions are never read again
+    for old in target.parent.glob("*.jsonl"):
+        if old != target:
+            old.unlink(missing_ok=True)
+
+
+def load_seed(dataset, cache, path=store.DATA_PATH):
+    """Put the saved figures for ``dataset``'s version into ``cache``; returns the count."""
+    try:
+        fh = open(seed_path(dataset.version, path))
+    except OSError:
+        return 0
+    with fh:
+        entries = [json.loads(line) for line in fh if line.strip()]
+    for entry in entries:
+        cache.put(cache.key(dataset, entry["figure"], entry["state"]), entry["payload"])
+    return len(entries)
+
+
+class Status:
+    """Progress of a background warm-up, readable from any session."""
+
+    def __init__(self):
+        self.done = 0
+        self.total = 0
+        self.finished = threading.Event()
+        self.summary = None
+        self.error = None
+
+    def update(self, done, total):
+        self.done, self.total = done, total
+
+
+def start(dataset, cache, path=store.DATA_PATH):
+    """Seed ``cache`` from disk, or warm it in the background; returns a :class:`Status`.
+
+    The pool runs in a ``python -m dashboard.warmup`` child process: inside a
+    Streamlit server ``__main__`` is the app script, which spawned pool
+    workers would otherwise re-execute.  A background thread follows the
+    child's progress and loads its seed into ``cache`` when it finishes.  The
+    child takes the warm-up lock and exits early if another process has
+    written the seed in the meantime.
+    """
+    status = Status()
+    seeded = load_seed(dataset, cache, path)
+    if seeded:
+        status.update(seeded, seeded)
+        status.finished.set()
+        return status
+
+    def run():
+        try:
+            for attr in STRUCTURES:
+                getattr(dataset, attr)
+            env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(store.ROOT), os.environ.get("PYTHONPATH")]))}
+            child = subprocess.Popen([sys.executable, "-m", "dashboard.warmup", "--data", str(path)],
+                                     cwd=store.ROOT, env=env, stdout=subprocess.PIPE, text=True)
+            for line in child.stdout:
+                if line.startswith("warmed "):
+                    done, total = line.split()[1].split("/")
+                    status.update(int(done), int(total))
+                elif line.startswith("{"):
+                    status.summary = json.loads(line)
+            if child.wait() != 0:
+                raise RuntimeError(f"warm-up exited with status {child.returncode}")
+            load_seed(dataset, cache, path)
+        except Exception as exc:  # warm-up is an optimization; never take the app down
+            status.error = exc
+        finally:
+            status.finished.set()
+
+    threading.Thread(target=run, name="cache-warmup", daemon=True).start()
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the default dashboard figures ahead of traffic")
+    parser.add_argument("--data", default=str(store.DATA_PATH), help="source CSV (default: DASHBOARD_DATA)")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    dataset = store.load_dataset(args.data)
+    with file_lock(lock_path(args.data)):
+        # Another process may have warmed this version while we waited
+        if seed_path(dataset.version, args.data).exists():
+            print(json.dumps({"version": dataset.version, "figures": 0, "skipped": True}))
+            return
+        summary = warm(dataset, FigureCache(max_entries=256), args.data, workers=args.workers,
+                       progress=lambda done, total: print(f"warmed {done}/{total}", flush=True))
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import pytest
+
+from dashboard import synthetic
+
+
+@pytest.fixture(scope="session")
+def dataset():
+    """A small in-memory synthetic dataset covering every page's columns."""
+    return synthetic.dataset(5_000, seed=1, years=range(2015, 2024), n_locations=120)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import compute
+from dashboard.analytics import SeriesMatrix
+
+EMPTY_TREND = pd.DataFrame({"Year": pd.Series([], dtype="int16"), "Population Type": pd.Series([], dtype=object),
+                            "Total": pd.Series([], dtype="int64")})
+
+
+def trend():
+    return pd.DataFrame({
+        "Year": [2001, 2002, 2003, 2001, 2003],
+        "Population Type": ["REF", "REF", "REF", "IDP", "IDP"],
+        "Total": [10, 20, 15, 5, 40],
+    })
+
+
+def test_metrics_over_observed_years():
+    matrix = SeriesMatrix.from_long(trend(), ["Population Type"])
+    assert list(matrix.series) == ["IDP", "REF"]
+    peaks, lows = matrix.extremes()
+    assert list(matrix.years[peaks]) == [2003, 2002]
+    assert list(matrix.years[lows]) == [2001, 2001]
+    # IDP skips 2002: its 2003 change is measured against 2001
+    yoy = matrix.frame(matrix.yoy_change())
+    assert yoy.loc[2003, "IDP"] == 700
+    np.testing.assert_allclose(matrix.cagr(), [(40 / 5 - 1) * 100, ((15 / 10) ** 0.5 - 1) * 100])
+
+
+def test_empty_matrix():
+    matrix = SeriesMatrix.from_long(EMPTY_TREND, ["Population Type"])
+    assert len(matrix) == 0
+    peaks, lows = matrix.extremes()
+    assert len(peaks) == len(lows) == 0
+    assert all(len(values) == 0 for values in matrix.stats().values())
+    assert len(matrix.cagr()) == 0
+
+
+def test_empty_trend_pages():
+    assert compute.peaks_valleys(EMPTY_TREND).empty
+    assert compute.trend_stats(EMPTY_TREND).empty
+    assert compute.yoy_change(EMPTY_TREND).empty
+
+
+def test_rolling_mean_uses_calendar_window():
+    # IDP is missing 2002, and no series has 2004
+    frame = pd.concat([trend(), pd.DataFrame({"Year": [2005], "Population Type": ["REF"], "Total": [35]})])
+    matrix = SeriesMatrix.from_long(frame, ["Population Type"])
+    means = matrix.frame(matrix.rolling_mean(window=3))
+    assert list(means["REF"]) == [10, 15, 15, 25]
+    assert means.loc[2003, "IDP"] == 22.5
+    assert np.isnan(means.loc[2002, "IDP"])
+    # 2005's window (2003-2005) only reaches back to 2003
+    assert means.loc[2005, "REF"] == 25
+    # A window longer than the series averages everything observed so far
+    np.testing.assert_allclose(matrix.rolling_mean(window=50)[:, 1], [10, 15, 15, 20])
+    np.testing.assert_array_equal(matrix.rolling_mean(window=1), matrix.values)
+    with pytest.raises(ValueError):
+        matrix.rolling_mean(window=0)
+
+
+def test_rolling_mean_of_empty_matrix():
+    matrix = SeriesMatrix.from_long(EMPTY_TREND, ["Population Type"])
+    assert matrix.rolling_mean().shape == (0, 0)
+    assert compute.rolling_mean(EMPTY_TREND)["Rolling Mean"].empty
+
+
+def test_rolling_mean_matches_rows():
+    rolled = compute.rolling_mean(trend(), window=2)
+    assert list(rolled["Rolling Mean"]) == [10, 15, 17.5, 5, 40]
+
+
+def test_metrics_share_one_matrix_per_trend():
+    frame = trend()
+    assert compute.trend_matrix(frame) is compute.trend_matrix(frame)
+    assert compute.trend_matrix(frame) is not compute.trend_matrix(trend())
@@ -0,0 +1,69 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from dashboard import api
+
+
+@pytest.fixture(scope="module")
+def service():
+    return api.QueryService()
+
+
+def test_empty_filters_give_empty_results(service):
+    for query in ({"year": ["1990"]}, {"pop_type": ["XYZ"]}):
+        status, _, body = service.respond("/trends", query)
+        assert status == HTTPStatus.OK
+        result = json.loads(body)
+        assert result["series"] == [] and result["stats"] == []
+    status, _, body = service.respond("/locations", {"year": ["1990"]})
+    assert status == HTTPStatus.OK and json.loads(body)["locations"] == []
+
+
+def test_etag_revalidation_skips_handler(service, monkeypatch):
+    status, etag, _ = service.respond("/health", {})
+    assert status == HTTPStatus.OK
+
+    def fail(dataset, query):
+        raise AssertionError("handler called on a revalidation")
+
+    monkeypatch.setitem(api.ROUTES, "/health", fail)
+    service.cache.clear()
+    status, same, body = service.respond("/health", {}, if_none_match=etag)
+    assert (status, same, body) == (HTTPStatus.NOT_MODIFIED, etag, b"")
+
+
+def test_internal_errors_hide_details(service, monkeypatch, capsys):
+    def fail(dataset, query):
+        raise KeyError("secret detail")
+
+    monkeypatch.setitem(api.ROUTES, "/health", fail)
+    service.cache.clear()
+
+    async def request():
+        server = await asyncio.start_server(api.Server(service).handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(request())
+    assert response.startswith(b"HTTP/1.1 500")
+    assert b"secret detail" not in response
+    assert "secret detail" in capsys.readouterr().err
+
+
+def test_malformed_query_is_rejected_before_revalidation(service):
+    version = service.dataset().version
+    for path, query in (("/trends", {"year": ["abc"]}), ("/deep-dive", {"gender": ["X"]}),
+                        ("/deep-dive", {"group_by": ["Total"]})):
+        key = (version, path, api.normalize_state(query))
+        etag = '"' + api.hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+        status, _, body = service.respond(path, query, if_none_match=f"{etag}, *")
+        assert status == HTTPStatus.BAD_REQUEST
+        assert "error" in json.loads(body)
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.bitmap import BitmapIndex, value_codes
+
+
+def expected_rows(frame, filters, nonzero=()):
+    mask = np.ones(len(frame), dtype=bool)
+    for col, values in filters.items():
+        if values is not None:
+            mask &= frame[col].isin(np.atleast_1d(values)).to_numpy()
+    for col in nonzero:
+        mask &= (frame[col] > 0).to_numpy()
+    return np.flatnonzero(mask)
+
+
+CASES = [
+    ({}, ()),
+    ({"Year": 2020}, ()),
+    ({"Year": [2016, 2020], "Population Type": "REF", "urbanRural": None}, ("Female Total",)),
+    ({"location": ["Colombo", "Kandy : District", "Location 00010 : Point"]}, ("Male Total",)),
+    ({"location": ["nowhere"]}, ()),
+    ({"Year": []}, ()),
+]
+
+
+# max_bitmaps=0 answers every column from its codes, the high-cardinality path
+@pytest.mark.parametrize("max_bitmaps", [0, 64, 10_000])
+@pytest.mark.parametrize("filters, nonzero", CASES)
+def test_select_matches_pandas(dataset, max_bitmaps, filters, nonzero):
+    index = BitmapIndex(dataset.frame, max_bitmaps=max_bitmaps)
+    selection = index.select(filters, nonzero=nonzero)
+    rows = expected_rows(dataset.frame, filters, nonzero)
+    np.testing.assert_array_equal(selection.rows, rows)
+    assert selection.sum("Total") == dataset.frame["Total"].to_numpy()[rows].sum()
+
+
+@pytest.mark.parametrize("max_bitmaps", [0, 64])
+def test_group_sum_matches_groupby(dataset, max_bitmaps):
+    index = BitmapIndex(dataset.frame, max_bitmaps=max_bitmaps)
+    filters = {"Population Type": ["REF", "IDP"]}
+    grouped = index.select(filters, nonzero=["Female Total"]).group_sum(["location", "Year"])
+    frame = dataset.frame.iloc[expected_rows(dataset.frame, filters, ["Female Total"])]
+    expected = frame.groupby(["location", "Year"], observed=True)["Total"].sum().reset_index()
+    pd.testing.assert_frame_equal(
+        grouped.astype({"location": str}),
+        expected.astype({"location": str, "Total": np.int64}),
+        check_dtype=False,
+    )
+
+
+def test_location_codes_reuse_the_frame(dataset):
+    index = BitmapIndex(dataset.frame)
+    assert "location" not in index.bitmaps and "Year" in index.bitmaps
+    assert np.shares_memory(index.codes["location"], dataset.frame["location"].array.codes)
+    assert list(index.labels["location"]) == sorted(dataset.frame["location"].unique())
+
+
+def test_value_codes_skip_unused_categories():
+    values = pd.Series(pd.Categorical(["b", "a", "b"], categories=["a", "b", "c"]))
+    codes, labels = value_codes(values)
+    assert list(labels) == ["a", "b"] and list(codes) == [1, 0, 1]
@@ -0,0 +1,44 @@
+import numpy as np
+
+from dashboard.cache import LRUCache, normalize_state
+
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"
+    cache.put("c", "3")
+    assert "b" not in cache
+    assert "a" in cache and "c" in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_until_under_byte_budget():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.put("a", "x" * 4)
+    cache.put("b", "x" * 4)
+    cache.put("c", "x" * 4)
+    assert list(cache._data) == ["b", "c"]
+    # Replacing a value frees its old size first
+    cache.put("c", "x" * 6)
+    assert list(cache._data) == ["b", "c"] and cache.stats()["bytes"] == 10
+    cache.put("d", "x" * 11)
+    assert len(cache) == 0 and cache.stats()["bytes"] == 0
+
+
+def test_stats_count_hits_and_misses():
+    cache = LRUCache()
+    cache.put("a", "1")
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_normalize_state_is_order_insensitive():
+    one = {"years": [2022, 2021], "pop_types": ("IDP", "REF"), "filters": {"b": None, "a": [1]}}
+    two = {"filters": {"a": [1], "b": None}, "pop_types": ["REF", "IDP"], "years": [np.int16(2021), 2022]}
+    assert normalize_state(one) == normalize_state(two)
+    assert hash(normalize_state(one)) == hash(normalize_state(two))
+    assert normalize_state({"years": [2021]}) != normalize_state({"years": [2022]})
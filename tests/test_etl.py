@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from dashboard import etl, synthetic
+from dashboard.store import CATEGORICAL_COLS, COLUMNS
+
+
+@pytest.fixture
+def raw(tmp_path):
+    """A raw export: HXL tag row, duplicated rows and one row with a bad Total."""
+    rows = synthetic.generate(400, seed=7, years=range(2019, 2022))
+    rows.loc[10, "Total"] += 5
+    rows = pd.concat([rows, rows.iloc[[3, 250]], rows.iloc[[3]]], ignore_index=True)
+    tags = pd.DataFrame([["#" + col.lower().replace(" ", "_") for col in rows.columns]], columns=rows.columns)
+    path = tmp_path / "demographics_residing_lka.csv"
+    pd.concat([tags, rows]).to_csv(path, index=False)
+    return path, rows
+
+
+def run(path, out_dir, **kwargs):
+    [report] = etl.run([path], out_dir, workers=1, **kwargs)
+    return report, pd.read_csv(report["output"])
+
+
+def test_partitions_cover_data_lines(raw):
+    path, _ = raw
+    ranges = etl.partitions(path, target_bytes=2048)
+    assert len(ranges) > 10
+    assert ranges[0][0] == len(open(path, "rb").readline())
+    assert ranges[-1][1] == path.stat().st_size
+    assert all(stop == start for (_, stop), (start, _) in zip(ranges, ranges[1:]))
+
+
+def test_cleans_deduplicates_and_reports(raw, tmp_path):
+    path, rows = raw
+    report, output = run(path, tmp_path / "out", partition_bytes=2048)
+    assert report["partitions"] > 10
+    assert (report["rows_read"], report["unparseable"], report["duplicates"]) == (404, 1, 3)
+    assert (report["invalid_totals"], report["rows_written"]) == (1, 400)
+
+    expected = rows.iloc[:400].astype({col: str for col in CATEGORICAL_COLS})
+    pd.testing.assert_frame_equal(output[COLUMNS], expected[COLUMNS], check_dtype=False)
+    codes, _ = pd.factorize(expected["Population Type"])
+    assert list(output["Population_Type_Encoded"]) == list(codes)
+    for pop_type in expected["Population Type"].unique():
+        assert (output[f"PopType_{pop_type}"] == (expected["Population Type"] == pop_type)).all()
+
+
+def test_partition_size_does_not_change_output(raw, tmp_path):
+    path, _ = raw
+    _, small = run(path, tmp_path / "small", partition_bytes=1024)
+    _, whole = run(path, tmp_path / "whole")
+    pd.testing.assert_frame_equal(small, whole)
+
+
+def test_strict_rejects_inconsistent_totals(raw, tmp_path):
+    path, _ = raw
+    with pytest.raises(etl.ValidationError, match="1 rows"):
+        run(path, tmp_path / "out", strict=True)
+
+
+def test_missing_columns_are_rejected(raw, tmp_path):
+    path, rows = raw
+    broken = tmp_path / "broken.csv"
+    rows.drop(columns=["urbanRural"]).to_csv(broken, index=False)
+    with pytest.raises(etl.ValidationError, match="urbanRural"):
+        run(broken, tmp_path / "out")
+
+
+def test_invalid_totals_allow_rows_without_sex_breakdown():
+    frame = synthetic.generate(3, seed=1)
+    gender_cols = [col for col in frame.columns if col.startswith(("Female", "Male"))]
+    frame.loc[0, gender_cols] = 0  # only a Total is reported
+    frame.loc[1, "Female 0-4"] += 1
+    assert list(etl.invalid_totals(frame)) == [False, True, False]
@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dashboard import export
+from dashboard.store import CATEGORICAL_COLS, COLUMNS
+
+STATE = {"filters": {"Year": 2020, "Population Type": ["REF"]}, "nonzero": []}
+
+
+@pytest.fixture(autouse=True)
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_DIR", tmp_path / "exports")
+    monkeypatch.setattr(export, "CHUNK_ROWS", 50)
+    return tmp_path / "exports"
+
+
+def read(path, fmt):
+    if fmt == "Parquet":
+        frame = pd.read_parquet(path)
+    else:
+        frame = pd.read_csv(path, compression="gzip" if fmt == "CSV (gzip)" else None,
+                            dtype={col: str for col in CATEGORICAL_COLS})
+    return frame.astype({col: str for col in CATEGORICAL_COLS}).astype({"Year": "int16"})
+
+
+@pytest.mark.parametrize("fmt", list(export.FORMATS))
+def test_round_trip(dataset, fmt):
+    selection = dataset.bitmap_index.select(STATE["filters"])
+    path = export.export(dataset, STATE, selection, fmt)
+    assert path.name.endswith(export.FORMATS[fmt][0])
+    expected = dataset.frame.take(selection.rows).reset_index(drop=True)
+    expected = expected.astype({col: str for col in CATEGORICAL_COLS})
+    assert len(expected) > export.CHUNK_ROWS
+    pd.testing.assert_frame_equal(read(path, fmt)[COLUMNS], expected, check_dtype=False)
+
+
+@pytest.mark.parametrize("fmt", list(export.FORMATS))
+def test_empty_selection_keeps_header(dataset, fmt):
+    selection = dataset.bitmap_index.select({"Year": 1990})
+    frame = read(export.export(dataset, {"Year": 1990}, selection, fmt), fmt)
+    assert frame.empty and list(frame.columns) == COLUMNS
+
+
+def test_repeat_request_reuses_file(dataset):
+    selection = dataset.bitmap_index.select(STATE["filters"])
+    path = export.export(dataset, STATE, selection, "CSV")
+    os.utime(path, (1, 1))
+    path.write_text("cached")
+    # Same state in another order hits the same file and refreshes its mtime
+    state = {"nonzero": [], "filters": {"Population Type": ["REF"], "Year": 2020}}
+    assert export.export(dataset, state, selection, "CSV") == path
+    assert path.read_text() == "cached" and path.stat().st_mtime > 1
+
+
+def test_prune_removes_least_recently_used(export_dir):
+    directory = export_dir / "v1"
+    directory.mkdir(parents=True)
+    for i, name in enumerate(["old.csv", "middle.csv", "new.csv"]):
+        path = directory / name
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (1000 + i, 1000 + i))
+    (directory / "partial.csv.123.tmp").write_bytes(b"x" * 1000)
+    export.prune(max_bytes=250)
+    assert sorted(p.name for p in directory.iterdir()) == ["middle.csv", "new.csv", "partial.csv.123.tmp"]
+    export.prune(max_bytes=0)
+    assert [p.name for p in directory.iterdir()] == ["partial.csv.123.tmp"]
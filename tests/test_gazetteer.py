@@ -0,0 +1,32 @@
+import numpy as np
+
+from dashboard import compute
+from dashboard.gazetteer import DEFAULT_COORDS, LOCATION_COORDS, Gazetteer, clean_locations, population_map
+
+
+def test_totals_fold_admin_levels(dataset):
+    totals = compute.location_totals(dataset, [2020, 2021], ["REF", "IDP"])
+    frame = dataset.frame
+    rows = frame[frame["Year"].isin([2020, 2021]) & frame["Population Type"].isin(["REF", "IDP"])]
+    expected = rows.groupby(clean_locations(rows["location"]).to_numpy())["Total"].sum()
+    expected = expected[expected.index.isin(totals["clean_location"])]
+    assert dict(zip(totals["clean_location"], totals["Total"])) == expected.to_dict()
+    assert totals["Total"].sum() == rows["Total"].sum()
+    colombo = totals.set_index("clean_location").loc["Colombo"]
+    assert (colombo["lat"], colombo["lon"]) == LOCATION_COORDS["Colombo"]
+
+
+def test_unknown_locations_use_default_coordinates():
+    gazetteer = Gazetteer(["Location 00001 : Point", "Kandy : District"])
+    assert list(gazetteer.names) == ["Kandy", "Location 00001"]
+    np.testing.assert_array_equal(gazetteer.lat, [LOCATION_COORDS["Kandy"][0], DEFAULT_COORDS[0]])
+
+
+def test_empty_selection_renders_bare_map(dataset):
+    for years, pop_types in (([], ["REF"]), ([2020], []), ([1990], ["REF"])):
+        points = compute.location_totals(dataset, years, pop_types)
+        assert points.empty
+        html = population_map(points).get_root().render()
+        assert "geo_json" not in html
+    html = population_map(compute.location_totals(dataset, [2020], ["REF"])).get_root().render()
+    assert "geo_json" in html
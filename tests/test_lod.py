@@ -0,0 +1,36 @@
+import pandas as pd
+
+from dashboard import lod
+
+
+def locations_frame(n):
+    # A real "Other" location among many, as in the UNHCR data
+    names = ["Other"] + [f"Loc {i:02d}" for i in range(n - 1)]
+    return pd.DataFrame({"location": names, "Total": range(n, 0, -1)})
+
+
+def test_fold_keeps_real_other_in_top_n():
+    frame = locations_frame(20)
+    folded, count = lod.fold_other(frame, "location", n=5)
+    assert count == 15
+    assert list(folded["location"].cat.categories) == ["Loc 00", "Loc 01", "Loc 02", "Loc 03", "Other", "Other (15 more)"]
+    assert folded.set_index("location")["Total"]["Other"] == 20
+    assert folded["Total"].sum() == frame["Total"].sum()
+
+
+def test_fold_does_not_merge_real_other_into_bucket():
+    frame = locations_frame(20).assign(Total=range(1, 21))  # "Other" is now the smallest
+    folded, count = lod.fold_other(frame, "location", n=5)
+    assert "Other" not in set(folded["location"])
+    assert folded.set_index("location")["Total"]["Other (15 more)"] == sum(range(1, 16))
+
+
+def test_other_label_avoids_clashes():
+    assert lod.other_label(["Other", "Other (3 more)"], 3) == "(Other (3 more))"
+
+
+def test_fold_by_two_columns():
+    frame = locations_frame(20).assign(Year=2020)
+    folded, count = lod.fold_columns(frame[["location", "Year", "Total"]], ["location", "Year"], n=5)
+    assert count == 15
+    assert len(folded) == 6
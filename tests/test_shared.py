@@ -0,0 +1,26 @@
+import pandas as pd
+
+from dashboard import shared
+
+
+def test_attach_returns_published_frames(dataset, tmp_path):
+    assert shared.attach(tmp_path, "v1") is None
+    shared.publish(tmp_path, "v1", lambda: dataset.frame, dataset.cube)
+    frame, cube = shared.attach(tmp_path, "v1")
+    pd.testing.assert_frame_equal(frame, dataset.frame)
+    pd.testing.assert_frame_equal(cube.cells, dataset.cube.cells.reset_index(drop=True))
+    # Numeric columns are read-only views of the mapped file, not private copies
+    assert not frame["Total"].to_numpy().flags.writeable
+
+
+def test_publish_once_and_drop_old_versions(dataset, tmp_path):
+    shared.publish(tmp_path, "v1", dataset.frame, dataset.cube)
+
+    def unexpected():
+        raise AssertionError("an existing version was published again")
+
+    shared.publish(tmp_path, "v1", unexpected, dataset.cube)
+    shared.publish(tmp_path, "v2", dataset.frame.head(10), dataset.cube)
+    assert [p.name for p in (tmp_path / shared.SHARED_DIR).iterdir()] == ["v2"]
+    assert len(shared.attach(tmp_path, "v2")[0]) == 10
+    assert shared.attach(tmp_path, "v1") is None
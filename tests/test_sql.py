@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard import sql, store, synthetic
+from dashboard.store import CATEGORICAL_COLS
+
+FILTERS = [
+    ({}, ()),
+    ({"Year": 2020, "Population Type": ["REF", "IDP"]}, ("Female Total",)),
+    ({"location": ["Colombo", "Kandy : District"], "urbanRural": None}, ("Male Total",)),
+    ({"Year": [1990]}, ()),
+    ({"location": []}, ()),
+]
+
+
+@pytest.fixture(scope="module")
+def backends(tmp_path_factory):
+    """The same source loaded by the in-memory and the SQLite backend."""
+    root = tmp_path_factory.mktemp("sql")
+    path = root / "demographics.csv"
+    synthetic.write_csv(path, 3_000, seed=9, years=range(2017, 2022), n_locations=80)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(store, "CACHE_DIR", root / "cache")
+        memory = store.load_dataset(path)
+        directory = store.store_dir(path)
+        paths = [store.partition_paths(directory, year) for year in (2017, 2018, 2019, 2020, 2021)]
+        database = sql.load(directory, memory.version, [data for data, _ in paths], memory.cube)
+    return memory, database
+
+
+def as_text(frame):
+    frame = frame.reset_index(drop=True)
+    return frame.astype({col: str for col in CATEGORICAL_COLS if col in frame.columns})
+
+
+def test_build_is_reused_per_version(backends):
+    memory, database = backends
+    assert sql.stored_version(database.path) == memory.version
+    mtime = database.path.stat().st_mtime_ns
+    assert sql.build(database.path.parent, memory.version, []) == database.path
+    assert database.path.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("filters, nonzero", FILTERS)
+def test_selections_match(backends, filters, nonzero):
+    memory, database = backends
+    expected = memory.bitmap_index.select(filters, nonzero=nonzero)
+    actual = database.bitmap_index.select(filters, nonzero=nonzero)
+    assert len(actual) == len(expected)
+    assert actual.sum("Total") == expected.sum("Total")
+    pd.testing.assert_frame_equal(as_text(actual.group_sum(["location", "Year"])),
+                                  as_text(expected.group_sum(["location", "Year"])), check_dtype=False)
+    rows = [as_text(chunk) for chunk in actual.iter_frames(500)]
+    expected_rows = as_text(memory.frame.take(expected.rows))
+    actual_rows = pd.concat(rows, ignore_index=True) if rows else expected_rows.iloc[:0]
+    pd.testing.assert_frame_equal(actual_rows, expected_rows, check_dtype=False)
+
+
+def test_metadata_and_summaries_match(backends):
+    memory, database = backends
+    assert database.columns == memory.columns
+    for col in ("location", "Country of Origin Name", "Year", "Total"):
+        assert database.categories(col) == memory.categories(col)
+    assert database.value_range("Total") == memory.value_range("Total")
+    pd.testing.assert_frame_equal(as_text(database.head(7)), as_text(memory.head(7)), check_dtype=False)
+    summary, expected = database.summary("Population Type"), memory.summary("Population Type")
+    pd.testing.assert_frame_equal(as_text(summary), as_text(expected), check_dtype=False)
+
+
+@pytest.mark.parametrize("column, ascending", [(None, True), ("Total", False), ("location", True), ("Year", False)])
+def test_table_pages_match(backends, column, ascending):
+    memory, database = backends
+    filters = {"urbanRural": ["U", "R"], "Total": (5, 500)}
+    for backend_selection in (None, {"Population Type": ["REF"]}):
+        views = [
+            dataset.table_view(None if backend_selection is None else dataset.bitmap_index.select(backend_selection),
+                               filters=filters, column=column, ascending=ascending)
+            for dataset in (memory, database)
+        ]
+        assert len(views[0]) == len(views[1]) > 0
+        for number in (1, 3):
+            pages = [as_text(view.page(number, 25)) for view in views]
+            pd.testing.assert_frame_equal(pages[1], pages[0], check_dtype=False)
+
+
+def test_where_clauses():
+    clause, params = sql.where({"Year": np.int16(2020), "location": ["a", "b"], "urbanRural": None},
+                               nonzero=["Male Total"], ranges={"Total": (1, 9)})
+    assert clause == '"Year" IN (?) AND "location" IN (?, ?) AND "Male Total" > 0 AND "Total" BETWEEN ? AND ?'
+    assert params == [2020, "a", "b", 1, 9] and type(params[0]) is int
+    assert sql.where({"Year": []}) == ("0", [])
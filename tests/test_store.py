@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from dashboard import store, synthetic
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "CACHE_DIR", tmp_path / "cache")
+    path = tmp_path / "demographics.csv"
+    synthetic.write_csv(path, 2_000, seed=3, years=range(2018, 2022))
+    return path
+
+
+def rows(path):
+    frame = store.load_dataset(path).frame.astype({col: str for col in store.CATEGORICAL_COLS})
+    return frame.sort_values(store.COLUMNS).reset_index(drop=True)
+
+
+def cold_version(path, tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "CACHE_DIR", tmp_path / "cold")
+    return store.load_dataset(path).version
+
+
+def test_cold_load_matches_source(source):
+    result = store.refresh(source)
+    assert (result["mode"], result["years"], result["rows"]) == ("cold", [2018, 2019, 2020, 2021], 2_000)
+    assert store.is_current(source)
+    assert store.refresh(source)["mode"] == "current"
+    expected = store.normalize(pd.read_csv(source)).astype({col: str for col in store.CATEGORICAL_COLS})
+    expected = expected.sort_values(store.COLUMNS).reset_index(drop=True)
+    pd.testing.assert_frame_equal(rows(source), expected, check_categorical=False)
+
+
+def test_appended_year_only_touches_that_partition(source, tmp_path, monkeypatch):
+    store.refresh(source)
+    before = store.read_manifest(store.store_dir(source))
+    new_rows = synthetic.generate(300, seed=4, years=range(2022, 2023))
+    new_rows.to_csv(source, mode="a", header=False, index=False)
+
+    result = store.refresh(source)
+    assert (result["mode"], result["years"], result["rows"]) == ("append", [2022], 300)
+    manifest = store.read_manifest(store.store_dir(source))
+    assert {year: manifest["partitions"][year] for year in before["partitions"]} == before["partitions"]
+    assert len(store.load_dataset(source)) == 2_300
+    assert manifest["version"] == cold_version(source, tmp_path, monkeypatch)
+
+
+def test_appended_rows_extend_an_existing_year(source):
+    store.refresh(source)
+    synthetic.generate(50, seed=5, years=range(2019, 2020)).to_csv(source, mode="a", header=False, index=False)
+    result = store.refresh(source)
+    assert (result["mode"], result["years"], result["rows"]) == ("append", [2019], 50)
+    assert len(store.load_dataset(source)) == 2_050
+
+
+def test_changed_year_is_rescanned(source, tmp_path, monkeypatch):
+    store.refresh(source)
+    before = store.read_manifest(store.store_dir(source))["partitions"]
+    raw = pd.read_csv(source)
+    raw.loc[raw.index[raw["Year"] == 2020][0], "Total"] += 1
+    raw.to_csv(source, index=False)
+
+    result = store.refresh(source)
+    assert (result["mode"], result["years"]) == ("rescan", [2020])
+    after = store.read_manifest(store.store_dir(source))
+    assert after["partitions"]["2020"] != before["2020"]
+    assert {year: after["partitions"][year] for year in ("2018", "2019", "2021")} == {
+        year: before[year] for year in ("2018", "2019", "2021")}
+    assert after["version"] == cold_version(source, tmp_path, monkeypatch)
+
+
+def test_removed_year_drops_its_partition(source):
+    store.refresh(source)
+    raw = pd.read_csv(source)
+    raw[raw["Year"] != 2021].to_csv(source, index=False)
+    result = store.refresh(source)
+    assert (result["mode"], result["years"]) == ("rescan", [2021])
+    directory = store.store_dir(source)
+    assert "2021" not in store.read_manifest(directory)["partitions"]
+    assert not any(path.exists() for path in store.partition_paths(directory, 2021))
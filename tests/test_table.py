@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from dashboard.table import SortIndex, TableView, filter_mask, page_count
+
+
+@pytest.mark.parametrize("column", ["Total", "location", "Year"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_permutation_is_a_stable_sort(dataset, column, ascending):
+    frame = dataset.frame
+    perm = SortIndex(frame).permutation(column, ascending)
+    expected = frame.sort_values(column, ascending=ascending, kind="stable").index.to_numpy()
+    np.testing.assert_array_equal(perm, expected)
+
+
+def test_filter_mask(dataset):
+    frame = dataset.frame
+    mask = filter_mask(frame, {"Population Type": ["REF", "IDP", "unknown"], "Total": (10, 100)})
+    expected = frame["Population Type"].isin(["REF", "IDP"]) & frame["Total"].between(10, 100)
+    np.testing.assert_array_equal(mask, expected.to_numpy())
+    assert filter_mask(frame, {}) is None
+    assert not filter_mask(frame, {"location": []}).any()
+
+
+def test_order_of_a_selection(dataset):
+    frame = dataset.frame
+    index = SortIndex(frame)
+    rows = np.flatnonzero((frame["Year"] == 2020).to_numpy())
+    mask = filter_mask(frame, {"urbanRural": ["U"]})
+    positions = index.order("Total", ascending=False, rows=rows, mask=mask)
+    subset = frame[(frame["Year"] == 2020) & (frame["urbanRural"] == "U")]
+    expected = subset.sort_values("Total", ascending=False, kind="stable").index.to_numpy()
+    np.testing.assert_array_equal(positions, expected)
+    # Without a column the selection keeps frame order, reversed when descending
+    np.testing.assert_array_equal(index.order(rows=rows, mask=mask), subset.index.to_numpy())
+    np.testing.assert_array_equal(index.order(ascending=False, rows=rows), rows[::-1])
+
+
+def test_pages(dataset):
+    frame = dataset.frame
+    view = TableView(frame, SortIndex(frame).order("Total"))
+    size = 20
+    pages = [view.page(number, size) for number in range(1, page_count(len(view), size) + 1)]
+    assert [len(p) for p in pages[:-1]] == [size] * (len(pages) - 1)
+    assert sum(len(p) for p in pages) == len(frame)
+    assert list(pages[0].index) == list(frame.sort_values("Total", kind="stable").index[:size])
+    assert view.page(len(pages) + 1, size).empty
+    assert page_count(0, size) == 1
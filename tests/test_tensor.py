@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from dashboard import compute
+from dashboard.store import AGE_GROUPS, FEMALE_COLS, MALE_COLS
+from dashboard.tensor import DemographicTensor
+
+AGE_COLS = MALE_COLS + FEMALE_COLS
+
+
+def grouped(frame, by):
+    """Per-``by`` age/gender sums from the rows, as a (groups..., gender, age) array."""
+    sums = frame.groupby(by, observed=True)[AGE_COLS].sum() if by else frame[AGE_COLS].sum().to_frame().T
+    return sums.to_numpy().reshape(len(sums), 2, len(AGE_GROUPS)), sums.index
+
+
+@pytest.fixture(scope="module")
+def tensor(dataset):
+    return DemographicTensor(dataset.cube)
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"Year": 2020},
+    {"Year": [2016, 2020], "Population Type": ["REF", "IDP"]},
+    {"location": ["Colombo", "Kandy : District"], "urbanRural": "U"},
+    {"Year": 1990},
+])
+def test_reduce_matches_groupby(dataset, tensor, filters):
+    frame = dataset.frame
+    mask = np.ones(len(frame), dtype=bool)
+    for axis, values in filters.items():
+        mask &= frame[axis].isin(np.atleast_1d(values)).to_numpy()
+    expected, _ = grouped(frame[mask], [])
+    np.testing.assert_array_equal(tensor.reduce(filters), expected[0])
+
+
+def test_keep_axes_in_requested_order(dataset, tensor):
+    counts = tensor.reduce({"Population Type": "REF"}, keep=("age", "Year"))
+    expected, years = grouped(dataset.frame[dataset.frame["Population Type"] == "REF"], ["Year"])
+    assert counts.shape == (len(AGE_GROUPS), len(tensor.labels["Year"]))
+    positions = tensor.positions("Year", list(years))
+    np.testing.assert_array_equal(counts[:, positions], expected.sum(axis=1).T)
+
+
+def test_marginals_are_memoized(tensor):
+    assert tensor.marginal({"Year"}) is tensor.marginal(("Year",))
+    assert tensor.marginal({"Year"}).sum() == tensor.counts.sum()
+
+
+def test_gender_totals_match_rows(dataset):
+    frame = dataset.frame
+    rows = frame[(frame["Year"] == 2021) & (frame["Population Type"] == "RET")]
+    totals = compute.gender_totals(dataset, [2021], ["RET"]).set_index("Gender")["Count"]
+    assert totals["Male"] == rows[MALE_COLS].to_numpy().sum()
+    assert totals["Female"] == rows[FEMALE_COLS].to_numpy().sum()